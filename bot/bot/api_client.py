@@ -1,12 +1,69 @@
+import copy
 import logging
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, AsyncIterator
 
-from aiohttp import ClientSession, ClientResponseError
+import msgpack
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector
+from cachetools import LRUCache
+
+from bot.config import (
+    API_CONNECT_TIMEOUT,
+    API_READ_TIMEOUT,
+    API_CONNECTION_LIMIT,
+    API_KEEPALIVE_TIMEOUT,
+    API_DNS_CACHE_TTL,
+    API_ETAG_CACHE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Одна долгоживущая сессия на процесс бота: keep-alive соединения и DNS-кэш
+# переиспользуются всеми хендлерами и геттерами диалогов
+_session: Optional[ClientSession] = None
+
+# Ответы запрашиваются в MessagePack: компактнее JSON и быстрее декодируются.
+# JSON в Accept не добавляем: DRF не учитывает q и при равной специфичности выбрал бы
+# первый рендерер, то есть JSON. Ответы в JSON (например, от прокси) клиент все равно
+# разбирает, а gzip aiohttp запрашивает и распаковывает сам
+ACCEPT = "application/msgpack"
+
+# Тела GET-ответов с их ETag по ключу (токен, URL, параметры): повторный запрос
+# уходит с If-None-Match, и при 304 тело берется отсюда без повторной загрузки
+_etag_cache: LRUCache = LRUCache(maxsize=API_ETAG_CACHE_SIZE)
+
+
+async def create_session() -> ClientSession:
+    """
+    Creates the shared HTTP session used by every `ApiClient`.
+
+    Should be called once at bot startup.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = TCPConnector(
+            limit=API_CONNECTION_LIMIT,
+            keepalive_timeout=API_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=API_DNS_CACHE_TTL,
+        )
+        timeout = ClientTimeout(total=None, connect=API_CONNECT_TIMEOUT, sock_read=API_READ_TIMEOUT)
+        _session = ClientSession(connector=connector, timeout=timeout)
+    return _session
+
+
+async def close_session():
+    """Closes the shared HTTP session. Should be called at bot shutdown."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
 
 
 class ApiClient:
     """
     An asynchronous client for interacting with the ToDo List API.
+
+    Instances are cheap: they only hold the per-user token and send
+    requests over the shared session created by `create_session`.
     """
 
     def __init__(self, base_url: str, token: Optional[str] = None):
@@ -18,10 +75,10 @@ class ApiClient:
             token (str, optional): The authentication token.
         """
         self.base_url = base_url
-        self.headers = {}
+        self.headers = {'Accept': ACCEPT}
         if token:
             self.headers['Authorization'] = f'Token {token}'
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
 
     async def _request(self, method: str, path: str, **kwargs) -> Union[Dict[str, Any], None]:
         """
@@ -32,22 +89,54 @@ class ApiClient:
             path (str): The API endpoint path.
 
         Returns:
-            A dictionary with the JSON response, or None for 204 status.
+            A dictionary with the decoded response, or None for 204 status.
         """
         url = f"{self.base_url}{path}"
-        async with ClientSession(headers=self.headers) as session:
-            try:
-                async with session.request(method, url, **kwargs) as response:
-                    response.raise_for_status()
-                    # Если ответ 204 No Content, возвращаем None
-                    if response.status == 204:
-                        return None
-                    return await response.json()
-            except ClientResponseError as e:
+        session = await create_session()
+        # Токен передается заголовком конкретного запроса, а не состоянием сессии
+        headers = {**self.headers, **(kwargs.pop("headers", None) or {})}
+
+        cache_key = cached = None
+        if method == "GET":
+            params = kwargs.get("params") or {}
+            cache_key = (headers.get("Authorization"), url, tuple(sorted((k, str(v)) for k, v in params.items())))
+            cached = _etag_cache.get(cache_key)
+            if cached is not None:
+                headers = {**headers, "If-None-Match": cached[0]}
+
+        async with session.request(method, url, headers=headers, **kwargs) as response:
+            if response.status >= 400:
                 # Добавим больше информации в лог для отладки
-                error_body = await e.text()
-                self.logger.error(f"API request failed: {e.status} {e.message} | Body: {error_body}")
-                raise
+                error_body = await self._decode_error_body(response)
+                self.logger.error(f"API request failed: {response.status} {response.reason} | Body: {error_body}")
+                response.raise_for_status()
+            # Если ответ 204 No Content, возвращаем None
+            if response.status == 204:
+                return None
+            # Данные не изменились - отдаем копию сохраненного тела
+            if response.status == 304 and cached is not None:
+                return copy.deepcopy(cached[1])
+
+            if response.content_type == "application/msgpack":
+                data = msgpack.unpackb(await response.read())
+            else:
+                data = await response.json()
+            etag = response.headers.get("ETag")
+            if cache_key is not None and etag:
+                _etag_cache[cache_key] = (etag, copy.deepcopy(data))
+            return data
+
+    @staticmethod
+    async def _decode_error_body(response: ClientResponse) -> Any:
+        """Decodes an error body for logging; never raises, so the HTTP error is not masked."""
+        # Ошибки отдаются в согласованном формате, то есть чаще всего в MessagePack
+        body = await response.read()
+        if response.content_type == "application/msgpack":
+            try:
+                return msgpack.unpackb(body)
+            except (ValueError, TypeError):
+                pass
+        return body.decode(response.charset or "utf-8", errors="replace")
 
     async def authenticate(self, telegram_id: int, username: str) -> str:
         """
@@ -64,13 +153,80 @@ class ApiClient:
         response = await self._request("POST", "/users/auth/telegram/", json=data)
         return response.get("token")
 
-    async def get_tasks(self) -> list:
-        """Fetches the list of tasks."""
-        return await self._request("GET", "/tasks/")
+    async def _get_page(
+        self,
+        path: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        filters: Optional[dict] = None
+    ) -> dict:
+        """
+        Fetches a single cursor-paginated page.
+
+        Args:
+            path (str): The API endpoint path.
+            cursor (str, optional): The opaque cursor returned as `next` by the previous page.
+            limit (int, optional): The page size.
+            filters (dict, optional): Server-side filters and `ordering`.
+
+        Returns:
+            A dictionary with `next` cursor and `results` list.
+        """
+        params = dict(filters or {})
+        if cursor:
+            params["cursor"] = cursor
+        if limit:
+            params["limit"] = limit
+        return await self._request("GET", path, params=params)
+
+    async def _iter_pages(
+        self,
+        path: str,
+        page_size: Optional[int] = None,
+        filters: Optional[dict] = None
+    ) -> AsyncIterator[dict]:
+        """Walks all pages of a cursor-paginated endpoint, yielding items one by one."""
+        cursor = None
+        while True:
+            page = await self._get_page(path, cursor=cursor, limit=page_size, filters=filters)
+            for item in page["results"]:
+                yield item
+            cursor = page.get("next")
+            if not cursor:
+                return
+
+    async def get_tasks_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        filters: Optional[dict] = None,
+        fields: Optional[list[str]] = None
+    ) -> dict:
+        """
+        Fetches a single page of tasks.
+
+        Args:
+            cursor: The cursor of the page, None for the first page.
+            limit: The page size.
+            filters: Server-side filters, e.g. {"is_completed": "false", "ordering": "due_date"}.
+            fields: A sparse fieldset, e.g. ["id", "title", "categories.name"]; all fields if omitted.
+        """
+        if fields:
+            filters = {**(filters or {}), "fields": ",".join(fields)}
+        return await self._get_page("/tasks/", cursor=cursor, limit=limit, filters=filters)
+
+    async def iter_tasks(self, page_size: Optional[int] = None, filters: Optional[dict] = None) -> AsyncIterator[dict]:
+        """Iterates over all (optionally filtered) tasks, fetching them page by page."""
+        async for task in self._iter_pages("/tasks/", page_size=page_size, filters=filters):
+            yield task
+
+    async def get_tasks(self, filters: Optional[dict] = None) -> list:
+        """Fetches the full list of (optionally filtered) tasks by walking all pages."""
+        return [task async for task in self.iter_tasks(filters=filters)]
 
     async def get_categories(self) -> list:
-        """Fetches the list of categories."""
-        return await self._request("GET", "/categories/")
+        """Fetches the full list of categories by walking all pages."""
+        return [category async for category in self._iter_pages("/categories/")]
 
     async def create_task(self, title: str, description: str, due_date: str, category_ids: list[str]) -> dict:
         """
@@ -93,9 +249,10 @@ class ApiClient:
         }
         return await self._request("POST", "/tasks/", json=payload)
 
-    async def get_task(self, task_id: str) -> dict:
-        """Fetches a single task by its ID."""
-        return await self._request("GET", f"/tasks/{task_id}/")
+    async def get_task(self, task_id: str, fields: Optional[list[str]] = None) -> dict:
+        """Fetches a single task by its ID, optionally only the given `fields`."""
+        params = {"fields": ",".join(fields)} if fields else None
+        return await self._request("GET", f"/tasks/{task_id}/", params=params)
 
     async def delete_task(self, task_id: str) -> None:
         """Deletes a task by its ID."""
@@ -114,15 +271,64 @@ class ApiClient:
         """
         return await self._request("PUT", f"/tasks/{task_id}/", json=payload)
 
-    async def patch_task(self, task_id: str, payload: dict) -> dict:
+    async def patch_task(self, task_id: str, payload: dict, minimal: bool = False) -> Optional[dict]:
         """
         Partially updates an existing task using PATCH.
 
         Args:
             task_id: The ID of the task to update.
             payload: A dictionary with the fields to update.
+            minimal: Asks the API not to send the task back (`Prefer: return=minimal`).
 
         Returns:
-            The updated task data.
+            The updated task data, or None if `minimal` is set.
+        """
+        headers = {"Prefer": "return=minimal"} if minimal else None
+        return await self._request("PATCH", f"/tasks/{task_id}/", json=payload, headers=headers)
+
+    async def complete_tasks(self, filters: dict) -> int:
+        """
+        Marks all open tasks matching the filters as completed in one request.
+
+        Args:
+            filters: Server-side filters, e.g. {"overdue": "true"}.
+
+        Returns:
+            The number of completed tasks.
+        """
+        response = await self._request("POST", "/tasks/actions/complete/", params=filters)
+        return response["affected"]
+
+    async def delete_tasks(self, filters: dict) -> int:
+        """
+        Deletes all tasks matching the filters in one request.
+
+        Args:
+            filters: Server-side filters; at least one is required.
+
+        Returns:
+            The number of deleted tasks.
+        """
+        response = await self._request("POST", "/tasks/actions/delete/", params=filters)
+        return response["affected"]
+
+    async def move_tasks_category(
+        self,
+        from_category_id: str,
+        to_category_id: str,
+        filters: Optional[dict] = None
+    ) -> int:
+        """
+        Moves all tasks matching the filters from one category to another.
+
+        Args:
+            from_category_id: The category to move tasks out of.
+            to_category_id: The category to move tasks into.
+            filters: Optional server-side filters narrowing the tasks.
+
+        Returns:
+            The number of moved tasks.
         """
-        return await self._request("PATCH", f"/tasks/{task_id}/", json=payload)
\ No newline at end of file
+        payload = {"from_category": from_category_id, "to_category": to_category_id}
+        response = await self._request("POST", "/tasks/actions/move-category/", params=filters or {}, json=payload)
+        return response["affected"]
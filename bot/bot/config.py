@@ -6,4 +6,38 @@ load_dotenv()
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 API_BASE_URL = os.getenv("API_BASE_URL", "http://backend:8000/api/v1")
-REDIS_URL = os.getenv("REDIS_URL_FOR_BOT", "redis://redis:6379/1")
\ No newline at end of file
+REDIS_URL = os.getenv("REDIS_URL_FOR_BOT", "redis://redis:6379/1")
+
+# HTTP-клиент к API бэкенда (см. bot.api_client)
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3"))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "10"))
+API_CONNECTION_LIMIT = int(os.getenv("API_CONNECTION_LIMIT", "100"))
+API_KEEPALIVE_TIMEOUT = float(os.getenv("API_KEEPALIVE_TIMEOUT", "30"))
+API_DNS_CACHE_TTL = int(os.getenv("API_DNS_CACHE_TTL", "300"))
+API_ETAG_CACHE_SIZE = int(os.getenv("API_ETAG_CACHE_SIZE", "1000"))
+
+# Ограничения Telegram на исходящие сообщения (см. bot.sender.SendScheduler)
+SEND_GLOBAL_RATE = float(os.getenv("SEND_GLOBAL_RATE", "30"))
+SEND_CHAT_RATE = float(os.getenv("SEND_CHAT_RATE", "1"))
+SEND_CHAT_BURST = float(os.getenv("SEND_CHAT_BURST", "3"))
+SEND_GROUP_PER_MINUTE = float(os.getenv("SEND_GROUP_PER_MINUTE", "20"))
+SEND_WORKERS = int(os.getenv("SEND_WORKERS", "8"))
+SEND_MAX_RETRIES = int(os.getenv("SEND_MAX_RETRIES", "3"))
+
+# Хранилище FSM и диалогов: брошенные диалоги удаляются из Redis по TTL (в секундах)
+FSM_STORAGE_URL = os.getenv("FSM_STORAGE_URL", REDIS_URL)
+FSM_STATE_TTL = int(os.getenv("FSM_STATE_TTL", str(24 * 60 * 60)))
+
+# Сколько секунд /notify/batch ждет отправки напоминаний, прежде чем ответить бэкенду;
+# должно быть меньше NOTIFICATION_HTTP_TIMEOUT бэкенда
+NOTIFY_BATCH_WAIT = float(os.getenv("NOTIFY_BATCH_WAIT", "5"))
+
+# Режим получения апдейтов: "polling" или "webhook" (см. bot.webhook_server)
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+WEB_SERVER_HOST = os.getenv("WEB_SERVER_HOST", "0.0.0.0")
+WEB_SERVER_PORT = int(os.getenv("WEB_SERVER_PORT", "8080"))
+WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+WEBHOOK_MAX_CONCURRENT_UPDATES = int(os.getenv("WEBHOOK_MAX_CONCURRENT_UPDATES", "100"))
@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from aiogram_dialog import DialogManager
+
+# Результаты хранятся в dialog_data, поэтому живут ровно столько, сколько диалог,
+# и вместе с ним попадают в хранилище FSM
+CACHE_KEY = "_cache"
+
+Fetch = Callable[[], Awaitable[Any]]
+
+
+async def cached(manager: DialogManager, **fetches: Fetch) -> dict[str, Any]:
+    """
+    Returns dialog-scoped results, calling the backend only for missing keys.
+
+    Missing keys are fetched concurrently. A fetch that raises is not cached,
+    so the next render tries again.
+
+    Args:
+        manager: The dialog manager whose `dialog_data` holds the cache.
+        **fetches: Zero-argument coroutine factories keyed by cache key.
+
+    Returns:
+        dict: The result for every requested key.
+    """
+    cache = manager.dialog_data.setdefault(CACHE_KEY, {})
+    missing = [key for key in fetches if key not in cache]
+    if missing:
+        results = await asyncio.gather(*(fetches[key]() for key in missing))
+        cache.update(zip(missing, results))
+
+    return {key: cache[key] for key in fetches}
+
+
+def is_cached(manager: DialogManager, key: str) -> bool:
+    """Checks whether a result is already cached for the dialog."""
+    return key in manager.dialog_data.get(CACHE_KEY, {})
+
+
+def invalidate(manager: DialogManager, *keys: str):
+    """
+    Drops cached results, e.g. after a save; without keys drops all of them.
+    """
+    cache = manager.dialog_data.get(CACHE_KEY)
+    if not cache:
+        return
+    if not keys:
+        cache.clear()
+        return
+    for key in keys:
+        cache.pop(key, None)
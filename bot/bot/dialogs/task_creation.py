@@ -9,6 +9,7 @@ from aiogram_dialog.widgets.text import Const, Format
 
 from bot.api_client import ApiClient
 from bot.config import API_BASE_URL
+from bot.dialogs.cache import cached, invalidate
 from bot.dialogs.states import CreateTask
 from bot.handlers.common import get_user_token
 
@@ -54,6 +55,7 @@ async def on_task_create(message: Message, manager: DialogManager):
             due_date=dialog_data.get("due_date"),
             category_ids=selected_categories
         )
+        invalidate(manager)
         await message.answer("✅ Task created successfully!")
     except Exception as e:
         await message.answer(f"Failed to create task: {e}")
@@ -70,10 +72,14 @@ async def get_categories_data(dialog_manager: DialogManager, **kwargs):
         return {"categories": []}
 
     api_client = ApiClient(API_BASE_URL, token)
-    try:
-        categories = await api_client.get_categories()
+
+    async def fetch_categories():
         # aiogram-dialog требует кортеж из (название, id)
-        return {"categories": [(cat["name"], cat["id"]) for cat in categories]}
+        return [(cat["name"], cat["id"]) for cat in await api_client.get_categories()]
+
+    try:
+        # Категории загружаются один раз за диалог, а не при каждом нажатии на Multiselect
+        return await cached(dialog_manager, categories=fetch_categories)
     except Exception:
         return {"categories": []}
 
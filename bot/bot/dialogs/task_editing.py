@@ -7,6 +7,7 @@ from aiogram_dialog.widgets.text import Const, Format
 
 from bot.api_client import ApiClient
 from bot.config import API_BASE_URL
+from bot.dialogs.cache import cached, invalidate, is_cached
 from bot.dialogs.states import EditTask
 from bot.handlers.common import get_user_token
 
@@ -18,20 +19,35 @@ async def get_task_data(dialog_manager: DialogManager, **kwargs):
     if not token or not task_id: return {}
 
     api_client = ApiClient(API_BASE_URL, token)
-    try:
-        task = await api_client.get_task(task_id)
-        all_categories = await api_client.get_categories()
-
-        current_category_ids = [cat['id'] for cat in task.get('categories', [])]
-        dialog_manager.dialog_data["category_multiselect_edit"] = current_category_ids
 
+    async def fetch_task():
+        task = await api_client.get_task(task_id, fields=["title", "categories.id"])
         return {
-            "task_title": task.get("title"),
-            "categories": [(cat["name"], cat["id"]) for cat in all_categories]
+            "title": task.get("title"),
+            "category_ids": [cat["id"] for cat in task.get("categories", [])],
         }
+
+    async def fetch_categories():
+        return [(cat["name"], cat["id"]) for cat in await api_client.get_categories()]
+
+    first_load = not is_cached(dialog_manager, "task")
+    try:
+        # Задача и категории загружаются параллельно и один раз за диалог
+        data = await cached(dialog_manager, task=fetch_task, categories=fetch_categories)
     except Exception:
         return {}
 
+    if first_load:
+        # Отмечаем текущие категории только при первой отрисовке, чтобы не сбросить выбор пользователя
+        multiselect = dialog_manager.find("category_multiselect_edit")
+        for category_id in data["task"]["category_ids"]:
+            await multiselect.set_checked(category_id, True)
+
+    return {
+        "task_title": data["task"]["title"],
+        "categories": data["categories"],
+    }
+
 
 async def on_save_categories(callback: CallbackQuery, button: Button, manager: DialogManager):
     user_id = manager.event.from_user.id
@@ -48,8 +64,9 @@ async def on_save_categories(callback: CallbackQuery, button: Button, manager: D
     try:
         # Формируем payload только с теми данными, что меняем
         payload = {"categories": selected_ids}
-        # Вызываем patch_task
-        await api_client.patch_task(task_id, payload)
+        # Ответ не нужен: кэш диалога сбрасывается ниже
+        await api_client.patch_task(task_id, payload, minimal=True)
+        invalidate(manager)
         await callback.answer("Categories updated!", show_alert=True)
     except Exception as e:
         await callback.answer(f"Failed to update categories: {e}", show_alert=True)
@@ -1,8 +1,11 @@
+import html
 import logging
+from datetime import datetime, timedelta, timezone
 
 import redis.asyncio as redis
 from aiogram import Router, F
-from aiogram.filters import CommandStart
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import Command, CommandObject, CommandStart
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram_dialog import DialogManager, StartMode
@@ -16,6 +19,12 @@ redis_client = redis.from_url(REDIS_URL, decode_responses=True)
 logger = logging.getLogger(__name__)
 
 TOKEN_KEY_PREFIX = "user_token:"
+TASKS_VIEW_KEY_PREFIX = "tasks_view:"
+TASKS_VIEW_TTL = 24 * 60 * 60
+TASKS_PAGE_SIZE = 5
+CLEAR_COMPLETED_DEFAULT_DAYS = 30
+# Только поля, которые выводит render_tasks_page
+TASKS_PAGE_FIELDS = ["id", "title", "is_completed", "due_date", "created_at", "categories.name"]
 
 
 async def get_user_token(user_id: int) -> str | None:
@@ -58,17 +67,112 @@ async def cmd_start(message: Message, state: FSMContext):
             "You are successfully authenticated.\n\n"
             "Available commands:\n"
             "/tasks - View your tasks\n"
-            "/newtask - Add a new task"
+            "/newtask - Add a new task\n"
+            "/complete_overdue - Mark all overdue tasks as done\n"
+            "/clear_completed [days] - Delete tasks completed more than N days ago\n"
+            "/move_category &lt;from&gt; -&gt; &lt;to&gt; - Move tasks between categories"
         )
     except Exception as e:
         logger.error(f"Authentication failed for user {user_id}: {e}")
         await message.answer(f"Authentication failed. Please try again later.")
 
 
+def render_tasks_page(tasks: list[dict], page: int, has_next: bool) -> tuple[str, InlineKeyboardMarkup]:
+    """
+    Renders one page of tasks as a single message with inline buttons.
+
+    Args:
+        tasks: The tasks of the page.
+        page: The zero-based page number.
+        has_next: Whether there is a next page.
+
+    Returns:
+        The message text and its inline keyboard.
+    """
+    lines = [f"<b>Your tasks</b> (page {page + 1})"]
+    keyboard = []
+    for number, task in enumerate(tasks, start=page * TASKS_PAGE_SIZE + 1):
+        task_id = task["id"]
+        status = "✅" if task["is_completed"] else "❌"
+        categories = ", ".join(html.escape(cat["name"]) for cat in task.get("categories", [])) or "N/A"
+        created_date = task["created_at"].split("T")[0]
+        lines.append(
+            f"{number}. <b>{html.escape(task['title'])}</b> {status}\n"
+            f"    <i>Categories:</i> {categories}\n"
+            f"    <i>Due:</i> {task.get('due_date', 'N/A')} · <i>Created:</i> {created_date}"
+        )
+
+        buttons = []
+        if not task["is_completed"]:
+            buttons.append(InlineKeyboardButton(text=f"✅ {number}", callback_data=f"task_complete:{task_id}:{page}"))
+        buttons.extend([
+            InlineKeyboardButton(text=f"✏️ {number}", callback_data=f"task_edit:{task_id}"),
+            InlineKeyboardButton(text=f"🗑️ {number}", callback_data=f"task_delete:{task_id}:{page}"),
+        ])
+        keyboard.append(buttons)
+
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton(text="« Prev", callback_data=f"tasks_page:{page - 1}"))
+    if has_next:
+        navigation.append(InlineKeyboardButton(text="Next »", callback_data=f"tasks_page:{page + 1}"))
+    if navigation:
+        keyboard.append(navigation)
+
+    return "\n\n".join(lines), InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+async def load_tasks_page(api_client: ApiClient, user_id: int, page: int) -> tuple[list[dict], int, bool]:
+    """
+    Fetches a single page of tasks from the cursor-paginated API.
+
+    Cursors of visited pages are kept in Redis, because they do not fit
+    into Telegram's 64-byte `callback_data`.
+
+    Returns:
+        The tasks, the actual page number (0 if the cursor has expired)
+        and whether there is a next page.
+    """
+    key = f"{TASKS_VIEW_KEY_PREFIX}{user_id}"
+    cursor = await redis_client.hget(key, str(page)) if page > 0 else None
+    if cursor is None:
+        page = 0
+
+    data = await api_client.get_tasks_page(cursor=cursor, limit=TASKS_PAGE_SIZE, fields=TASKS_PAGE_FIELDS)
+    if data["next"]:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, str(page + 1), data["next"])
+            pipe.expire(key, TASKS_VIEW_TTL)
+            await pipe.execute()
+
+    # Страница опустела (например, после удаления последней задачи) - показываем предыдущую
+    if not data["results"] and page > 0:
+        return await load_tasks_page(api_client, user_id, page - 1)
+
+    return data["results"], page, bool(data["next"])
+
+
+async def show_tasks_page(callback: CallbackQuery, token: str, page: int):
+    """Re-renders the tasks message of a callback in place."""
+    api_client = ApiClient(base_url=API_BASE_URL, token=token)
+    tasks, page, has_next = await load_tasks_page(api_client, callback.from_user.id, page)
+    if not tasks:
+        await callback.message.edit_text("You have no tasks yet. Use /newtask to add one.")
+        return
+
+    text, keyboard = render_tasks_page(tasks, page, has_next)
+    try:
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    except TelegramBadRequest as e:
+        # Повторное нажатие на ту же страницу: Telegram отвечает "message is not modified"
+        if "message is not modified" not in e.message:
+            raise
+
+
 @router.message(F.text == "/tasks")
 async def cmd_tasks(message: Message):
+    """Handler for the /tasks command: shows the first page of tasks."""
     user_id = message.from_user.id
-    logger.info(f"User {user_id} requested tasks.")
 
     token = await get_user_token(user_id)
     if not token:
@@ -78,57 +182,36 @@ async def cmd_tasks(message: Message):
 
     api_client = ApiClient(base_url=API_BASE_URL, token=token)
     try:
-        logger.info(f"Fetching tasks from API for user {user_id}.")
-        tasks = await api_client.get_tasks()
-        logger.info(f"Received {len(tasks)} tasks from API.")
-
+        tasks, page, has_next = await load_tasks_page(api_client, user_id, 0)
         if not tasks:
-            logger.info(f"No tasks for user {user_id}. Sending info message.")
             await message.answer("You have no tasks yet. Use /newtask to add one.")
             return
 
-        logger.info(f"Looping through tasks to send messages for user {user_id}.")
-        for task in tasks:
-            task_id = task.get('id', 'NO_ID')
-            logger.info(f"Processing task with id: {task_id} (len: {len(str(task_id))})")
-
-            status = "✅" if task['is_completed'] else "❌"
-            created_date = task['created_at'].split('T')[0]
-
-            buttons = []
-            if not task['is_completed']:
-                complete_callback = f"task_complete:{task_id}"
-                logger.info(f"  - Complete callback data: '{complete_callback}' (len: {len(complete_callback)})")
-                buttons.append(
-                    InlineKeyboardButton(text="Mark as Done ✅", callback_data=complete_callback)
-                )
-
-            edit_callback = f"task_edit:{task_id}"
-            delete_callback = f"task_delete:{task_id}"
-            logger.info(f"  - Edit callback data: '{edit_callback}' (len: {len(edit_callback)})")
-            logger.info(f"  - Delete callback data: '{delete_callback}' (len: {len(delete_callback)})")
-
-            buttons.extend([
-                InlineKeyboardButton(text="Edit ✏️", callback_data=edit_callback),
-                InlineKeyboardButton(text="Delete 🗑️", callback_data=delete_callback)
-            ])
-
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[buttons])
-
-            response_text = (
-                f"<b>{task['title']}</b> {status}\n"
-                f"<i>Categories:</i> {', '.join([cat['name'] for cat in task.get('categories', [])]) or 'N/A'}\n"
-                f"<i>Due:</i> {task.get('due_date', 'N/A')}\n"
-                f"<i>Created:</i> {created_date}\n"
-            )
-            logger.info(f"Sending message for task {task_id}.")
-            await message.answer(response_text, reply_markup=keyboard)
-            logger.info(f"Message for task {task_id} sent.")
+        text, keyboard = render_tasks_page(tasks, page, has_next)
+        await message.answer(text, reply_markup=keyboard)
 
     except Exception as e:
         logger.error(f"Caught exception in cmd_tasks for user {user_id}: {e}", exc_info=True)
         await message.answer("Failed to fetch tasks. Please try again later.")
 
+
+@router.callback_query(F.data.startswith("tasks_page:"))
+async def handle_tasks_page(callback: CallbackQuery):
+    """Handles the 'Prev'/'Next' buttons by editing the tasks message in place."""
+    page = int(callback.data.split(":")[1])
+    token = await get_user_token(callback.from_user.id)
+    if not token:
+        await callback.answer("Authentication error. Please /start again.", show_alert=True)
+        return
+
+    try:
+        await show_tasks_page(callback, token, page)
+        await callback.answer()
+    except Exception as e:
+        logger.error(f"Failed to show tasks page {page} for user {callback.from_user.id}: {e}")
+        await callback.answer("Failed to fetch tasks.", show_alert=True)
+
+
 @router.message(F.text == "/newtask")
 async def cmd_new_task(message: Message, dialog_manager: DialogManager):
     """Handler for starting the task creation dialog."""
@@ -138,7 +221,7 @@ async def cmd_new_task(message: Message, dialog_manager: DialogManager):
 @router.callback_query(F.data.startswith("task_complete:"))
 async def handle_task_complete(callback: CallbackQuery):
     """Handles the 'Mark as Done' button press."""
-    task_id = callback.data.split(":")[1]
+    _, task_id, *page = callback.data.split(":")
     user_id = callback.from_user.id
     token = await get_user_token(user_id)
 
@@ -150,14 +233,18 @@ async def handle_task_complete(callback: CallbackQuery):
     try:
         # Формируем payload только с теми данными, что меняем
         payload = {"is_completed": True}
-        # Вызываем новый метод patch_task
-        await api_client.patch_task(task_id, payload)
-
-        # Обновляем текст сообщения, убираем кнопки
-        await callback.message.edit_text(
-            text=callback.message.text.replace("❌", "✅ Done!"),
-            reply_markup=None
-        )
+        # Ответ не нужен: список перерисовывается отдельным запросом
+        await api_client.patch_task(task_id, payload, minimal=True)
+
+        if page:
+            # Перерисовываем страницу списка задач
+            await show_tasks_page(callback, token, int(page[0]))
+        else:
+            # Сообщение старого формата с одной задачей: обновляем текст, убираем кнопки
+            await callback.message.edit_text(
+                text=callback.message.text.replace("❌", "✅ Done!"),
+                reply_markup=None
+            )
         await callback.answer("Task marked as completed!")
     except Exception as e:
         logger.error(f"Failed to complete task {task_id} for user {user_id}: {e}")
@@ -179,7 +266,7 @@ async def handle_task_edit(callback: CallbackQuery, dialog_manager: DialogManage
 @router.callback_query(F.data.startswith("task_delete:"))
 async def handle_task_delete(callback: CallbackQuery):
     """Handles the 'Delete' button press."""
-    task_id = callback.data.split(":")[1]
+    _, task_id, *page = callback.data.split(":")
     user_id = callback.from_user.id
     token = await get_user_token(user_id)
 
@@ -190,8 +277,91 @@ async def handle_task_delete(callback: CallbackQuery):
     api_client = ApiClient(base_url=API_BASE_URL, token=token)
     try:
         await api_client.delete_task(task_id)
-        await callback.message.delete()  # Удаляем сообщение с задачей
+        if page:
+            await show_tasks_page(callback, token, int(page[0]))
+        else:
+            await callback.message.delete()  # Удаляем сообщение старого формата с задачей
         await callback.answer("Task deleted successfully!")
     except Exception as e:
         logger.error(f"Failed to delete task {task_id} for user {user_id}: {e}")
-        await callback.answer("Failed to delete task.", show_alert=True)
\ No newline at end of file
+        await callback.answer("Failed to delete task.", show_alert=True)
+
+
+@router.message(Command("complete_overdue"))
+async def cmd_complete_overdue(message: Message):
+    """Handler for /complete_overdue: completes all overdue tasks in one request."""
+    user_id = message.from_user.id
+    token = await get_user_token(user_id)
+    if not token:
+        await message.answer("You are not authenticated. Please use /start first.")
+        return
+
+    api_client = ApiClient(base_url=API_BASE_URL, token=token)
+    try:
+        affected = await api_client.complete_tasks({"overdue": "true"})
+        await message.answer(f"✅ Marked {affected} overdue task(s) as done.")
+    except Exception as e:
+        logger.error(f"Failed to complete overdue tasks for user {user_id}: {e}")
+        await message.answer("Failed to update tasks. Please try again later.")
+
+
+@router.message(Command("clear_completed"))
+async def cmd_clear_completed(message: Message, command: CommandObject):
+    """Handler for /clear_completed [days]: deletes tasks completed more than N days ago."""
+    user_id = message.from_user.id
+    token = await get_user_token(user_id)
+    if not token:
+        await message.answer("You are not authenticated. Please use /start first.")
+        return
+
+    days = CLEAR_COMPLETED_DEFAULT_DAYS
+    if command.args:
+        if not command.args.strip().isdigit():
+            await message.answer("Usage: /clear_completed [days], e.g. /clear_completed 7")
+            return
+        days = int(command.args)
+
+    # Отдельной даты завершения нет, поэтому возраст считаем по последнему изменению задачи
+    updated_before = datetime.now(timezone.utc) - timedelta(days=days)
+    api_client = ApiClient(base_url=API_BASE_URL, token=token)
+    try:
+        affected = await api_client.delete_tasks({
+            "is_completed": "true",
+            "updated_before": updated_before.isoformat(),
+        })
+        await message.answer(f"🗑️ Deleted {affected} task(s) completed more than {days} day(s) ago.")
+    except Exception as e:
+        logger.error(f"Failed to clear completed tasks for user {user_id}: {e}")
+        await message.answer("Failed to delete tasks. Please try again later.")
+
+
+@router.message(Command("move_category"))
+async def cmd_move_category(message: Message, command: CommandObject):
+    """Handler for /move_category <from> -> <to>: moves all tasks between categories by name."""
+    user_id = message.from_user.id
+    token = await get_user_token(user_id)
+    if not token:
+        await message.answer("You are not authenticated. Please use /start first.")
+        return
+
+    from_name, separator, to_name = (command.args or "").partition("->")
+    from_name, to_name = from_name.strip(), to_name.strip()
+    if not separator or not from_name or not to_name:
+        await message.answer("Usage: /move_category &lt;from&gt; -&gt; &lt;to&gt;, e.g. /move_category Work -&gt; Personal")
+        return
+
+    api_client = ApiClient(base_url=API_BASE_URL, token=token)
+    try:
+        categories = {category["name"]: category["id"] for category in await api_client.get_categories()}
+        missing = [name for name in (from_name, to_name) if name not in categories]
+        if missing:
+            await message.answer(f"Unknown category: {html.escape(missing[0])}")
+            return
+
+        affected = await api_client.move_tasks_category(categories[from_name], categories[to_name])
+        await message.answer(
+            f"Moved {affected} task(s) from <b>{html.escape(from_name)}</b> to <b>{html.escape(to_name)}</b>."
+        )
+    except Exception as e:
+        logger.error(f"Failed to move tasks between categories for user {user_id}: {e}")
+        await message.answer("Failed to move tasks. Please try again later.")
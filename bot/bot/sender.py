@@ -0,0 +1,281 @@
+import asyncio
+import enum
+import itertools
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+logger = logging.getLogger(__name__)
+
+ChatId = Union[int, str]
+
+
+class Priority(enum.IntEnum):
+    """Send lanes; lower values are sent first."""
+    INTERACTIVE = 0
+    NOTIFICATION = 1
+
+
+# Приоритет исходящих запросов текущего контекста (хендлера или фоновой задачи)
+send_priority: ContextVar[Priority] = ContextVar("send_priority", default=Priority.INTERACTIVE)
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at `rate` tokens per second.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): The maximum burst size.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay(self) -> float:
+        """Returns how many seconds to wait until a token is available."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        """Takes one token; call only after `delay()` returned 0."""
+        self.tokens -= 1
+
+    def pause(self, seconds: float):
+        """Blocks the bucket, e.g. for the `retry_after` given by Telegram."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def is_idle(self) -> bool:
+        """True if the bucket is full and not paused, i.e. it can be dropped."""
+        return self.delay() == 0.0 and self.tokens >= self.capacity
+
+
+@dataclass(order=True)
+class _SendJob:
+    priority: int
+    seq: int
+    chat_id: ChatId = field(compare=False)
+    call: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+
+
+class SendScheduler:
+    """
+    A central queue for outgoing Telegram requests.
+
+    Enforces a global rate limit and per-chat limits (stricter for groups),
+    sends interactive replies ahead of reminders, preserves message order
+    within a chat and honours `retry_after` from flood-control errors.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+        group_rate: float = 20 / 60,
+        workers: int = 8,
+        max_retries: int = 3,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.workers_count = workers
+        self.max_retries = max_retries
+
+        self._ready: asyncio.PriorityQueue[_SendJob] = asyncio.PriorityQueue()
+        self._chats: dict[ChatId, deque[_SendJob]] = {}
+        self._buckets: dict[ChatId, TokenBucket] = {}
+        self._global_lock = asyncio.Lock()
+        self._seq = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._metrics = {"sent": 0, "failed": 0, "retried": 0, "in_flight": 0}
+        self._pending = {priority: 0 for priority in Priority}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Starts the worker tasks."""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers_count)]
+            logger.info(f"Send scheduler started with {self.workers_count} workers.")
+
+    async def stop(self):
+        """Stops the workers and fails requests that were not sent yet."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for jobs in self._chats.values():
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_exception(RuntimeError("Send scheduler stopped."))
+        self._chats.clear()
+
+    async def submit(self, chat_id: ChatId, call: Callable[[], Awaitable[Any]], priority: Optional[Priority] = None) -> Any:
+        """
+        Queues a request for a chat and waits for its result.
+
+        Args:
+            chat_id: The target chat.
+            call: A zero-argument coroutine factory performing the request.
+            priority: The send lane; defaults to the `send_priority` of the context.
+
+        Returns:
+            The result of the request.
+        """
+        priority = send_priority.get() if priority is None else priority
+        job = _SendJob(
+            priority=priority,
+            seq=next(self._seq),
+            chat_id=chat_id,
+            call=call,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._pending[job.priority] += 1
+
+        jobs = self._chats.setdefault(chat_id, deque())
+        jobs.append(job)
+        # В очереди готовых лежит только голова очереди чата - так сохраняется порядок сообщений
+        if len(jobs) == 1:
+            self._ready.put_nowait(job)
+
+        return await job.future
+
+    def stats(self) -> dict:
+        """Returns queue-depth and delivery counters."""
+        return {
+            "queued": {priority.name.lower(): count for priority, count in self._pending.items()},
+            "ready": self._ready.qsize(),
+            "active_chats": len(self._chats),
+            **self._metrics,
+        }
+
+    def _is_group(self, chat_id: ChatId) -> bool:
+        return not isinstance(chat_id, int) or chat_id < 0
+
+    def _chat_bucket(self, chat_id: ChatId) -> TokenBucket:
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            if len(self._buckets) > 10_000:
+                self._buckets = {
+                    key: value for key, value in self._buckets.items()
+                    if key in self._chats or not value.is_idle()
+                }
+            if self._is_group(chat_id):
+                bucket = TokenBucket(self.group_rate, 1)
+            else:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._buckets[chat_id] = bucket
+        return bucket
+
+    def _defer(self, job: _SendJob, delay: float):
+        asyncio.get_running_loop().call_later(delay, self._ready.put_nowait, job)
+
+    async def _acquire_global(self):
+        async with self._global_lock:
+            while (delay := self.global_bucket.delay()) > 0:
+                await asyncio.sleep(delay)
+            self.global_bucket.consume()
+
+    def _finish(self, job: _SendJob):
+        """Removes the chat head and schedules the next request of the chat."""
+        self._pending[job.priority] -= 1
+        jobs = self._chats[job.chat_id]
+        jobs.popleft()
+        if jobs:
+            self._ready.put_nowait(jobs[0])
+        else:
+            del self._chats[job.chat_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._ready.get()
+            if job.future.cancelled():
+                self._finish(job)
+                continue
+
+            bucket = self._chat_bucket(job.chat_id)
+            delay = bucket.delay()
+            if delay > 0:
+                self._defer(job, delay)
+                continue
+
+            bucket.consume()
+            await self._acquire_global()
+            self._metrics["in_flight"] += 1
+            try:
+                result = await job.call()
+            except TelegramRetryAfter as e:
+                job.attempts += 1
+                if job.attempts <= self.max_retries:
+                    logger.warning(f"Flood control for chat {job.chat_id}, retrying in {e.retry_after}s.")
+                    self._metrics["retried"] += 1
+                    bucket.pause(e.retry_after)
+                    self._defer(job, e.retry_after)
+                    continue
+                self._metrics["failed"] += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            except Exception as e:
+                self._metrics["failed"] += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self._metrics["sent"] += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._metrics["in_flight"] -= 1
+
+            self._finish(job)
+
+
+class SendSchedulerMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware routing every chat-bound request through the
+    `SendScheduler`, so all outgoing sends, edits and deletes are rate limited.
+    """
+
+    def __init__(self, scheduler: SendScheduler):
+        self.scheduler = scheduler
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None or not self.scheduler.running:
+            return await make_request(bot, method)
+
+        return await self.scheduler.submit(chat_id, lambda: make_request(bot, method))
@@ -1,11 +1,23 @@
 import asyncio
 import logging
+import uuid
+from typing import Any, Optional
 
 from aiohttp import web
-from aiogram import Bot
+from aiogram import Bot, Dispatcher
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramNotFound, TelegramUnauthorizedError
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from bot.sender import Priority, SendScheduler, send_priority
 
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_SIZE = 1000
+
+# Ошибки, при которых повторная отправка того же сообщения не поможет
+# (бот заблокирован, чат не найден и т.п.)
+PERMANENT_SEND_ERRORS = (TelegramBadRequest, TelegramForbiddenError, TelegramNotFound, TelegramUnauthorizedError)
+
 
 async def handle_notification(request: web.Request):
     """
@@ -21,6 +33,7 @@ async def handle_notification(request: web.Request):
             logger.warning("Received invalid notification payload.")
             return web.json_response({"status": "bad_request"}, status=400)
 
+        send_priority.set(Priority.NOTIFICATION)
         await bot.send_message(chat_id=telegram_id, text=message_text)
         logger.info(f"Sent notification to {telegram_id}")
         return web.json_response({"status": "ok"})
@@ -30,16 +43,196 @@ async def handle_notification(request: web.Request):
         return web.json_response({"status": "error"}, status=500)
 
 
-async def start_webhook_server(bot: Bot):
+async def _deliver_notification(bot: Bot, notification_id: str, telegram_id: int, message_text: str) -> str:
+    """
+    Sends a single notification, logging the outcome.
+
+    Returns:
+        str: `sent`, `failed` if sending again cannot help, or `retry`.
+    """
+    # Напоминания уступают очередь интерактивным ответам пользователям
+    send_priority.set(Priority.NOTIFICATION)
+    try:
+        await bot.send_message(chat_id=telegram_id, text=message_text)
+    except PERMANENT_SEND_ERRORS as e:
+        logger.error(f"Error sending notification {notification_id} to {telegram_id}: {e}")
+        return "failed"
+    except Exception as e:
+        logger.warning(f"Transient error sending notification {notification_id} to {telegram_id}: {e}")
+        return "retry"
+
+    logger.info(f"Sent notification {notification_id} to {telegram_id}")
+    return "sent"
+
+
+def _run_in_background(app: web.Application, coro) -> asyncio.Task:
+    """Schedules a coroutine and keeps a reference to it until it finishes."""
+    task = asyncio.create_task(coro)
+    app["background_tasks"].add(task)
+    task.add_done_callback(app["background_tasks"].discard)
+    return task
+
+
+async def handle_notification_batch(request: web.Request):
     """
-    Starts the aiohttp web server for handling webhooks.
+    Delivers a batch of notifications and reports the outcome of each one.
+
+    Expects `{"notifications": [{"telegram_id": ..., "message": ...}, ...]}`.
+    Waits up to the app's `notify_batch_wait` seconds for the sends and
+    replies with a per-item result: `{"id": ..., "status": ...}` where the
+    status is `sent`, `failed`, `retry` (the backend should deliver it again)
+    or `queued` (still being sent in the background), or
+    `{"status": "bad_request"}` for an invalid item.
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        return web.json_response({"status": "bad_request"}, status=400)
+
+    notifications = data.get("notifications") if isinstance(data, dict) else None
+    if not isinstance(notifications, list):
+        logger.warning("Received invalid notification batch payload.")
+        return web.json_response({"status": "bad_request"}, status=400)
+    if len(notifications) > MAX_BATCH_SIZE:
+        return web.json_response({"status": "too_large", "max_batch_size": MAX_BATCH_SIZE}, status=413)
+
+    bot: Bot = request.app["bot"]
+    results = []
+    positions = {}
+    for item in notifications:
+        telegram_id = item.get("telegram_id") if isinstance(item, dict) else None
+        message_text = item.get("message") if isinstance(item, dict) else None
+        if not telegram_id or not message_text:
+            results.append({"status": "bad_request"})
+            continue
+
+        notification_id = uuid.uuid4().hex
+        task = _run_in_background(request.app, _deliver_notification(bot, notification_id, telegram_id, message_text))
+        positions[task] = len(results)
+        results.append({"id": notification_id, "status": "queued"})
+
+    # Бэкенд уже пометил напоминания отправленными: о неудачах нужно сообщить ему,
+    # чтобы он повторил доставку или снял отметку. Не успевшие за отведенное время
+    # отправки продолжаются в фоне
+    if positions:
+        done, _ = await asyncio.wait(positions, timeout=request.app["notify_batch_wait"])
+        for task in done:
+            if not task.cancelled():
+                results[positions[task]]["status"] = task.result()
+
+    counts = {status: sum(r["status"] == status for r in results) for status in ("sent", "queued", "retry", "failed")}
+    logger.info(f"Notification batch of {len(results)}: {counts}.")
+    return web.json_response({"status": "done", "results": results})
+
+
+async def handle_metrics(request: web.Request):
+    """Exposes send-queue depth and delivery counters."""
+    scheduler: SendScheduler = request.app["scheduler"]
+    return web.json_response({"send_queue": scheduler.stats()})
+
+
+async def _wait_background_tasks(app: web.Application):
+    """Lets queued notifications finish before the server shuts down."""
+    if app["background_tasks"]:
+        await asyncio.gather(*app["background_tasks"], return_exceptions=True)
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """
+    Feeds Telegram updates into the dispatcher in the background, with at
+    most `max_concurrent_updates` updates being handled at once.
+
+    When the limit is reached the handler delays its reply, so Telegram
+    slows down instead of the bot piling up unbounded tasks.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, *, max_concurrent_updates: int, **kwargs: Any):
+        super().__init__(dispatcher=dispatcher, bot=bot, handle_in_background=True, **kwargs)
+        self._semaphore = asyncio.Semaphore(max_concurrent_updates)
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        update = await request.json(loads=bot.session.json_loads)
+        await self._semaphore.acquire()
+
+        task = asyncio.create_task(self._background_feed_update(bot=bot, update=update))
+        self._background_feed_update_tasks.add(task)
+        task.add_done_callback(self._background_feed_update_tasks.discard)
+        task.add_done_callback(lambda _: self._semaphore.release())
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def close(self) -> None:
+        """Waits for updates being handled, then closes the bot session."""
+        if self._background_feed_update_tasks:
+            await asyncio.gather(*self._background_feed_update_tasks, return_exceptions=True)
+        await super().close()
+
+
+def create_app(bot: Bot, scheduler: SendScheduler, *, notify_batch_wait: float = 5.0) -> web.Application:
+    """
+    Creates the aiohttp application serving the notification endpoints.
+
+    Args:
+        bot: The bot sending the notifications.
+        scheduler: The send queue, exposed on `/metrics`.
+        notify_batch_wait: How many seconds `/notify/batch` waits for the sends
+            before replying; keep it below the backend's HTTP read timeout.
     """
     app = web.Application()
     app["bot"] = bot
+    app["scheduler"] = scheduler
+    app["notify_batch_wait"] = notify_batch_wait
+    app["background_tasks"] = set()
     app.router.add_post("/notify", handle_notification)
+    app.router.add_post("/notify/batch", handle_notification_batch)
+    app.router.add_get("/metrics", handle_metrics)
+    app.on_shutdown.append(_wait_background_tasks)
+    return app
+
+
+def setup_update_webhook(
+    app: web.Application,
+    dispatcher: Dispatcher,
+    bot: Bot,
+    *,
+    path: str,
+    secret_token: Optional[str],
+    max_concurrent_updates: int,
+):
+    """
+    Registers the Telegram update endpoint on the application.
+
+    Updates are accepted on `path` and verified with the secret token sent by
+    Telegram in the `X-Telegram-Bot-Api-Secret-Token` header. The dispatcher's
+    startup and shutdown hooks are tied to the application lifecycle.
 
+    Args:
+        app: The application created by `create_app`.
+        dispatcher: The dispatcher handling the updates.
+        bot: The bot the updates belong to.
+        path: The secret URL path Telegram posts updates to.
+        secret_token: The token Telegram must send with every update.
+        max_concurrent_updates: How many updates may be handled at once.
+    """
+    handler = BoundedRequestHandler(
+        dispatcher,
+        bot,
+        secret_token=secret_token,
+        max_concurrent_updates=max_concurrent_updates,
+    )
+    handler.register(app, path=path)
+    setup_application(app, dispatcher, bot=bot)
+
+
+async def start_webhook_server(app: web.Application, host: str, port: int) -> web.AppRunner:
+    """
+    Starts the aiohttp web server in the current event loop.
+
+    Returns:
+        web.AppRunner: The runner; call `cleanup()` on it to stop the server.
+    """
     runner = web.AppRunner(app)
     await runner.setup()
-    site = web.TCPSite(runner, '0.0.0.0', 8080)
-    logger.info("Starting webhook server on port 8080...")
-    await site.start()
\ No newline at end of file
+    site = web.TCPSite(runner, host, port)
+    logger.info(f"Starting webhook server on port {port}...")
+    await site.start()
+    return runner
@@ -1,41 +1,149 @@
 import asyncio
+import json
 import logging
+import signal
 import sys
+from functools import partial
 
 from aiogram import Bot, Dispatcher
+from aiohttp import web
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.base import DefaultKeyBuilder
+from aiogram.fsm.storage.redis import RedisStorage
 from aiogram_dialog import setup_dialogs
 
-from bot.config import BOT_TOKEN
+from bot import api_client
+from bot.config import (
+    BOT_MODE,
+    BOT_TOKEN,
+    FSM_STORAGE_URL,
+    FSM_STATE_TTL,
+    NOTIFY_BATCH_WAIT,
+    SEND_GLOBAL_RATE,
+    SEND_CHAT_RATE,
+    SEND_CHAT_BURST,
+    SEND_GROUP_PER_MINUTE,
+    SEND_WORKERS,
+    SEND_MAX_RETRIES,
+    WEB_SERVER_HOST,
+    WEB_SERVER_PORT,
+    WEBHOOK_BASE_URL,
+    WEBHOOK_MAX_CONCURRENT_UPDATES,
+    WEBHOOK_MAX_CONNECTIONS,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+)
 from bot.handlers import common
 from bot.dialogs.task_creation import create_task_dialog
-from bot.webhook_server import start_webhook_server
+from bot.sender import SendScheduler, SendSchedulerMiddleware
+from bot.webhook_server import create_app, setup_update_webhook, start_webhook_server
 from bot.dialogs.task_editing import edit_task_dialog
 
 
+async def run_polling(bot: Bot, dp: Dispatcher, app: web.Application):
+    """Receives updates with long polling; the notification server runs alongside."""
+    runner = await start_webhook_server(app, WEB_SERVER_HOST, WEB_SERVER_PORT)
+    try:
+        await bot.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot)
+    finally:
+        await runner.cleanup()
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher, app: web.Application):
+    """
+    Receives updates on a webhook served by the same aiohttp app as `/notify`.
+
+    Every replica registers the same URL, so several of them can run behind
+    one load balancer.
+    """
+    async def set_webhook():
+        await bot.set_webhook(
+            url=f"{WEBHOOK_BASE_URL.rstrip('/')}{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=dp.resolve_used_update_types(),
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+        )
+
+    dp.startup.register(set_webhook)
+    setup_update_webhook(
+        app,
+        dp,
+        bot,
+        path=WEBHOOK_PATH,
+        secret_token=WEBHOOK_SECRET,
+        max_concurrent_updates=WEBHOOK_MAX_CONCURRENT_UPDATES,
+    )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    runner = await start_webhook_server(app, WEB_SERVER_HOST, WEB_SERVER_PORT)
+    try:
+        await stop_event.wait()
+    finally:
+        await runner.cleanup()
+
+
 async def main():
     """The main function to start the bot."""
     if not BOT_TOKEN:
         logging.error("BOT_TOKEN environment variable is not set.")
         sys.exit(1)
+    if BOT_MODE == "webhook" and not WEBHOOK_BASE_URL:
+        logging.error("WEBHOOK_BASE_URL environment variable is required in webhook mode.")
+        sys.exit(1)
+    if BOT_MODE == "webhook" and not WEBHOOK_SECRET:
+        # Без секрета любой, кто знает адрес вебхука, может присылать поддельные апдейты
+        logging.error("WEBHOOK_SECRET environment variable is required in webhook mode.")
+        sys.exit(1)
 
     default_properties = DefaultBotProperties(parse_mode=ParseMode.HTML)
     bot = Bot(token=BOT_TOKEN, default=default_properties)
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+
+    # Все исходящие запросы в чаты проходят через общую очередь с rate limiting
+    scheduler = SendScheduler(
+        global_rate=SEND_GLOBAL_RATE,
+        chat_rate=SEND_CHAT_RATE,
+        chat_burst=SEND_CHAT_BURST,
+        group_rate=SEND_GROUP_PER_MINUTE / 60,
+        workers=SEND_WORKERS,
+        max_retries=SEND_MAX_RETRIES,
+    )
+    bot.session.middleware(SendSchedulerMiddleware(scheduler))
+
+    # Состояния и стеки диалогов хранятся в Redis, поэтому реплики бота делят общие разговоры.
+    # with_destiny нужен aiogram_dialog, чтобы ключи стеков и контекстов не пересекались с FSM.
+    storage = RedisStorage.from_url(
+        FSM_STORAGE_URL,
+        key_builder=DefaultKeyBuilder(with_destiny=True),
+        state_ttl=FSM_STATE_TTL,
+        data_ttl=FSM_STATE_TTL,
+        json_dumps=partial(json.dumps, ensure_ascii=False, separators=(",", ":")),
+    )
+    # Блокировка в Redis не даёт двум репликам одновременно обрабатывать апдейты одного чата
+    dp = Dispatcher(storage=storage, events_isolation=storage.create_isolation())
+    dp.startup.register(scheduler.start)
+    dp.startup.register(api_client.create_session)
+    dp.shutdown.register(scheduler.stop)
+    dp.shutdown.register(api_client.close_session)
+    dp.shutdown.register(storage.close)
 
     # Register routers and dialogs
     dp.include_router(common.router)
     dp.include_router(create_task_dialog)
     setup_dialogs(dp)
 
-    await bot.delete_webhook(drop_pending_updates=True)
     dp.include_router(edit_task_dialog)
-    await dp.start_polling(bot)
 
-    asyncio.create_task(start_webhook_server(bot))
+    app = create_app(bot, scheduler, notify_batch_wait=NOTIFY_BATCH_WAIT)
+    if BOT_MODE == "webhook":
+        await run_webhook(bot, dp, app)
+    else:
+        await run_polling(bot, dp, app)
 
 
 if __name__ == "__main__":
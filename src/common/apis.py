@@ -0,0 +1,15 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.metrics import hit_ratios, metrics_snapshot
+
+
+class MetricsApi(APIView):
+    """API exposing the in-process counters of the serving worker."""
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        """Return the counters and cache hit ratios of the worker process that handled the request."""
+        counters = metrics_snapshot()
+        return Response({**counters, **hit_ratios(counters)})
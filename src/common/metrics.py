@@ -0,0 +1,53 @@
+import threading
+from collections import Counter
+
+# Счетчики живут в памяти процесса (воркера gunicorn/celery)
+_lock = threading.Lock()
+_counters: Counter = Counter()
+
+
+def metric_incr(name: str, value: int = 1) -> None:
+    """
+    Increments an in-process counter.
+
+    Args:
+        name (str): The counter name, e.g. `auth_cache.miss`.
+        value (int): The increment.
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def metrics_snapshot() -> dict[str, int]:
+    """
+    Returns a copy of all counters of the current process.
+
+    Returns:
+        dict[str, int]: Counter values keyed by name.
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def hit_ratios(counters: dict[str, int]) -> dict[str, float]:
+    """
+    Derives cache hit ratios from `<cache>.*hit` and `<cache>.miss` counters.
+
+    Args:
+        counters (dict[str, int]): A snapshot returned by `metrics_snapshot`.
+
+    Returns:
+        dict[str, float]: Ratios keyed by `<cache>.hit_ratio`.
+    """
+    ratios = {}
+    for name, misses in counters.items():
+        if not name.endswith('.miss'):
+            continue
+        prefix = name[:-len('miss')]
+        hits = sum(
+            value for key, value in counters.items()
+            if key.startswith(prefix) and key.endswith('hit')
+        )
+        ratios[f"{prefix}hit_ratio"] = round(hits / (hits + misses), 4) if hits + misses else 0.0
+
+    return ratios
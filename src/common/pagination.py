@@ -0,0 +1,192 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+
+class KeysetPagination:
+    """
+    Keyset (cursor) pagination over a stable, unique ordering.
+
+    The cursor is an opaque token holding the ordering values of the last row
+    of the page, so every page is fetched with an index range scan and no
+    ``COUNT(*)`` query is ever issued. The ordering is taken from the queryset
+    (falling back to ``default_ordering``) and always ends with ``id`` as a
+    tie-breaker.
+    """
+    default_ordering = ('-created_at', 'id')
+    default_limit = 50
+    max_limit = 200
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+
+    def __init__(self):
+        self.ordering: tuple[str, ...] = self.default_ordering
+        self.next_cursor: Optional[str] = None
+
+    def get_limit(self, request: Request) -> int:
+        """Returns the page size requested by the client, clamped to `max_limit`."""
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+
+        return max(1, min(limit, self.max_limit))
+
+    def get_ordering(self, queryset: QuerySet) -> tuple[str, ...]:
+        """Returns the queryset ordering with a unique `id` tie-breaker appended."""
+        ordering = tuple(queryset.query.order_by) or self.default_ordering
+        if not {'id', '-id'} & set(ordering):
+            ordering += ('id',)
+
+        return ordering
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request) -> list:
+        """
+        Returns a single page of the queryset and remembers the next cursor.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            request (Request): The current request.
+
+        Returns:
+            list: The rows of the requested page.
+        """
+        queryset, limit = self._page_queryset(queryset, request)
+        return self._finish_page(list(queryset), limit)
+
+    async def apaginate_queryset(self, queryset: QuerySet, request: Request) -> list:
+        """Async variant of `paginate_queryset`, fetching the page with async iteration."""
+        queryset, limit = self._page_queryset(queryset, request)
+        return self._finish_page([row async for row in queryset], limit)
+
+    def _page_queryset(self, queryset: QuerySet, request: Request) -> tuple[QuerySet, int]:
+        """Returns the lazy queryset of the requested page and the page size."""
+        self.ordering = self.get_ordering(queryset)
+        limit = self.get_limit(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if queryset._fields is not None:
+            # values()-запросу нужны колонки сортировки, из них строится курсор следующей страницы
+            missing = [field.lstrip('-') for field in self.ordering if field.lstrip('-') not in queryset._fields]
+            if missing:
+                queryset = queryset.values(*queryset._fields, *missing)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = self.decode_cursor(cursor, model=queryset.model)
+            queryset = queryset.filter(self._build_keyset_filter(values))
+
+        # Запрашиваем на одну строку больше, чтобы узнать, есть ли следующая страница
+        return queryset[:limit + 1], limit
+
+    def _finish_page(self, rows: list, limit: int) -> list:
+        """Trims the extra row and remembers the next cursor."""
+        if len(rows) > limit:
+            rows = rows[:limit]
+            self.next_cursor = self.encode_cursor(rows[-1])
+
+        return rows
+
+    def get_paginated_data(self, data: list) -> dict:
+        """Wraps serialized page data together with the next cursor."""
+        return {'next': self.next_cursor, 'results': data}
+
+    def encode_cursor(self, row: Any) -> str:
+        """Encodes the ordering values of a row (model instance or dict) into a cursor."""
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+        payload = json.dumps([self.ordering, values], separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor: str, *, model) -> list:
+        """Decodes a cursor back into typed ordering values."""
+        try:
+            payload = base64.urlsafe_b64decode(cursor.encode('ascii'))
+            ordering, raw_values = json.loads(payload)
+            if tuple(ordering) != self.ordering or len(raw_values) != len(self.ordering):
+                raise ValueError("Cursor does not match the requested ordering.")
+
+            return [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, raw_values)
+            ]
+        except (
+            binascii.Error,
+            UnicodeError,
+            TypeError,
+            ValueError,
+            FieldDoesNotExist,
+            DjangoValidationError,
+        ):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+
+    def _build_keyset_filter(self, values: list) -> Q:
+        """
+        Builds the row-value comparison `(a, b) > (x, y)` honoring the
+        direction of each ordering field.
+        """
+        keyset_filter = Q()
+        equal_prefix = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset_filter |= equal_prefix & Q(**{f'{name}__{lookup}': value})
+            equal_prefix &= Q(**{name: value})
+
+        return keyset_filter
+
+
+def get_paginated_data(
+    *,
+    pagination_class: type[KeysetPagination],
+    serializer_class,
+    queryset: QuerySet,
+    request: Request,
+) -> dict:
+    """
+    Paginates a queryset and serializes the page.
+
+    Args:
+        pagination_class: The pagination class to use.
+        serializer_class: The serializer used for the page rows.
+        queryset (QuerySet): The queryset to paginate.
+        request (Request): The current request.
+
+    Returns:
+        dict: The `next` cursor and the serialized `results`.
+    """
+    paginator = pagination_class()
+    page = paginator.paginate_queryset(queryset, request)
+    data = serializer_class(page, many=True).data
+
+    return paginator.get_paginated_data(data)
+
+
+async def aget_paginated_data(
+    *,
+    pagination_class: type[KeysetPagination],
+    serializer_class,
+    queryset: QuerySet,
+    request: Request,
+) -> dict:
+    """
+    Async variant of `get_paginated_data`.
+
+    Related objects the serializer reads must be prefetched, since
+    serialization itself runs synchronously.
+    """
+    paginator = pagination_class()
+    page = await paginator.apaginate_queryset(queryset, request)
+    data = serializer_class(page, many=True).data
+
+    return paginator.get_paginated_data(data)
@@ -0,0 +1,57 @@
+from typing import Any, Optional
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.mediatypes import _MediaType
+
+# orjson и msgpack сами не умеют Decimal, ленивые строки и т.п. - такие значения
+# приводятся так же, как в стандартном JSONRenderer DRF
+_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    A drop-in replacement for DRF's `JSONRenderer` backed by orjson.
+
+    Produces compact UTF-8 JSON; an `indent` requested by the client or the
+    browsable API is rendered with two spaces, the only indent orjson has.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[dict] = None) -> bytes:
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self._wants_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=_encoder.default, option=option)
+
+    def _wants_indent(self, accepted_media_type: Optional[str], renderer_context: dict) -> bool:
+        if renderer_context.get('indent'):
+            return True
+        if accepted_media_type:
+            return bool(_MediaType(accepted_media_type).params.get('indent'))
+        return False
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders responses as MessagePack, chosen with `Accept: application/msgpack`.
+
+    Smaller and cheaper to decode than JSON for the bot's list responses.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[dict] = None) -> bytes:
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encoder.default)
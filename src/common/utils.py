@@ -0,0 +1,36 @@
+import os
+import time
+import uuid
+from typing import Optional
+
+
+def uuid7(timestamp_ms: Optional[int] = None) -> uuid.UUID:
+    """
+    Generates a version 7 UUID (RFC 9562).
+
+    The first 48 bits hold the Unix time in milliseconds and the rest is
+    random, so ids sort by creation time and new rows are appended to the
+    right edge of a btree index instead of random pages.
+
+    Args:
+        timestamp_ms (int, optional): The Unix time in milliseconds to embed;
+            defaults to now. Used to keep old rows ordered when backfilling.
+
+    Returns:
+        uuid.UUID: The generated UUID.
+    """
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+
+    random_bits = int.from_bytes(os.urandom(10), 'big')
+    rand_a = (random_bits >> 62) & 0xFFF
+    rand_b = random_bits & ((1 << 62) - 1)
+
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | rand_a << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
@@ -39,6 +39,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Сжимает ответы от 200 байт для клиентов с Accept-Encoding: gzip
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,6 +68,12 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
+
+# Асинхронные варианты API задач, категорий и авторизации. Включается вместе с запуском
+# под ASGI (uvicorn core.asgi:application); под WSGI каждый запрос к ним поднимал бы
+# свой event loop
+API_ASYNC_VIEWS = env.bool('API_ASYNC_VIEWS', default=False)
 
 
 DATABASES = {
@@ -73,6 +81,11 @@ DATABASES = {
 }
 
 
+CACHES = {
+    'default': env.cache('CACHE_URL', default='redis://redis:6379/2'),
+}
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -106,13 +119,39 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # JSON через orjson по умолчанию, MessagePack - по заголовку Accept: application/msgpack
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.ORJSONRenderer',
+        'common.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'common.parsers.ORJSONParser',
+        'common.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Кэш аутентификации по токену: локальный LRU процесса перед общим Redis-кэшем.
+# Локальный TTL короткий, т.к. инвалидация доходит только до общего кэша и текущего процесса
+AUTH_TOKEN_CACHE_TTL = env.int('AUTH_TOKEN_CACHE_TTL', default=300)
+AUTH_TOKEN_LOCAL_CACHE_TTL = env.int('AUTH_TOKEN_LOCAL_CACHE_TTL', default=10)
+AUTH_TOKEN_LOCAL_CACHE_SIZE = env.int('AUTH_TOKEN_LOCAL_CACHE_SIZE', default=10_000)
+
+# Кэш чтения задач и категорий (см. todos.cache). Ключи версионируются по пользователю,
+# поэтому устаревшие записи не инвалидируются явно, а просто истекают по TTL
+TODOS_CACHE_TTL = env.int('TODOS_CACHE_TTL', default=300)
+
+# Массовые операции над задачами: максимум элементов в запросе и размер пачки INSERT/UPDATE
+TODOS_BULK_MAX_ITEMS = env.int('TODOS_BULK_MAX_ITEMS', default=10_000)
+TODOS_BULK_BATCH_SIZE = env.int('TODOS_BULK_BATCH_SIZE', default=1000)
+
 CELERY_BROKER_URL = env('REDIS_URL')
 CELERY_RESULT_BACKEND = env('REDIS_URL')
 CELERY_ACCEPT_CONTENT = ['application/json']
@@ -121,4 +160,23 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
 
-BOT_WEBHOOK_URL = env('BOT_WEBHOOK_URL', default='http://bot:8080/notify')
\ No newline at end of file
+BOT_WEBHOOK_URL = env('BOT_WEBHOOK_URL', default='http://bot:8080/notify')
+BOT_WEBHOOK_BATCH_URL = env('BOT_WEBHOOK_BATCH_URL', default='http://bot:8080/notify/batch')
+
+# Сколько просроченных задач забирает один проход check_for_due_tasks за транзакцию
+NOTIFICATION_CLAIM_BATCH_SIZE = env.int('NOTIFICATION_CLAIM_BATCH_SIZE', default=500)
+
+# Сколько уведомлений обрабатывает одна Celery-задача send_due_task_notifications
+NOTIFICATION_DISPATCH_CHUNK_SIZE = env.int('NOTIFICATION_DISPATCH_CHUNK_SIZE', default=50)
+
+# Доставка уведомлений в webhook бота: пакеты по NOTIFICATION_WEBHOOK_BATCH_SIZE,
+# пул соединений на процесс воркера, ограничение одновременных запросов
+# и экспоненциальные повторы. Таймаут должен быть больше NOTIFY_BATCH_WAIT бота:
+# столько бот ждет отправки пакета, прежде чем ответить
+NOTIFICATION_HTTP_TIMEOUT = env.float('NOTIFICATION_HTTP_TIMEOUT', default=10.0)
+NOTIFICATION_HTTP_CONNECT_TIMEOUT = env.float('NOTIFICATION_HTTP_CONNECT_TIMEOUT', default=3.0)
+NOTIFICATION_MAX_IN_FLIGHT = env.int('NOTIFICATION_MAX_IN_FLIGHT', default=20)
+NOTIFICATION_WEBHOOK_BATCH_SIZE = env.int('NOTIFICATION_WEBHOOK_BATCH_SIZE', default=100)
+NOTIFICATION_MAX_RETRIES = env.int('NOTIFICATION_MAX_RETRIES', default=5)
+NOTIFICATION_RETRY_BACKOFF = env.int('NOTIFICATION_RETRY_BACKOFF', default=2)
+NOTIFICATION_RETRY_BACKOFF_MAX = env.int('NOTIFICATION_RETRY_BACKOFF_MAX', default=300)
\ No newline at end of file
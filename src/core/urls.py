@@ -18,10 +18,13 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework.authtoken import views
 
+from common.apis import MetricsApi
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/users/', include(('users.urls', 'users'))),
     path('api/v1/', include(('todos.urls', 'todos'))),
+    path('api/v1/metrics/', MetricsApi.as_view(), name='metrics'),
     path('api-token-auth/', views.obtain_auth_token)
 ]
\ No newline at end of file
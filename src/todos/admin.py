@@ -8,7 +8,7 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'user', 'created_at')
     search_fields = ('name', 'user__username')
     list_filter = ('user',)
-    readonly_fields = ('id', 'created_at', 'updated_at')
+    readonly_fields = ('id', 'legacy_id', 'created_at', 'updated_at')
 
 
 @admin.register(Task)
@@ -17,5 +17,5 @@ class TaskAdmin(admin.ModelAdmin):
     list_display = ('id', 'title', 'user', 'due_date', 'is_completed', 'created_at')
     search_fields = ('title', 'description', 'user__username')
     list_filter = ('is_completed', 'user', 'due_date')
-    readonly_fields = ('id', 'created_at', 'updated_at')
+    readonly_fields = ('id', 'legacy_id', 'created_at', 'updated_at')
     filter_horizontal = ('categories',)
\ No newline at end of file
@@ -1,14 +1,197 @@
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from functools import partial
+from typing import Optional
+
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django_filters.utils import translate_validation
 
+from common.pagination import KeysetPagination, aget_paginated_data, get_paginated_data
+from todos.cache import (
+    acached_for_user,
+    auser_cache_version,
+    cached_for_user,
+    user_cache_version,
+    user_data_etag,
+)
+from todos.filters import TaskFilter
 from todos.models import Category, Task
 from todos import services, selectors
 
 
+def _representation_etag(request, *, user_id: int, version: int, namespace: str, params) -> str:
+    """Returns the ETag of the data in the negotiated format (JSON or MessagePack)."""
+    namespace = f"{namespace}.{request.accepted_renderer.format}"
+    return user_data_etag(user_id=user_id, version=version, namespace=namespace, params=params)
+
+
+def _sparse_fields(request) -> tuple[Optional[list[str]], Optional[list[str]]]:
+    """
+    Parses the `fields` query parameter, e.g. `?fields=id,title,categories.name`.
+
+    Category fields are requested with a `categories.` prefix; a bare
+    `categories` returns all of them.
+
+    Returns:
+        The requested task fields and category fields, each None for all fields.
+
+    Raises:
+        rest_framework.exceptions.ValidationError: If a field is unknown.
+    """
+    requested = {name.strip() for name in request.query_params.get('fields', '').split(',') if name.strip()}
+    if not requested:
+        return None, None
+
+    fields, category_fields, unknown = set(), set(), []
+    for name in requested:
+        field, _, subfield = name.partition('.')
+        if field not in selectors.TASK_FIELDS or (subfield and (
+            field != 'categories' or subfield not in selectors.CATEGORY_FIELDS
+        )):
+            unknown.append(name)
+        fields.add(field)
+        if subfield:
+            category_fields.add(subfield)
+
+    if unknown:
+        raise serializers.ValidationError({'fields': [f"Unknown field: {name}" for name in sorted(unknown)]})
+
+    category_fields = None if 'categories' in requested or not category_fields else category_fields
+    return (
+        [field for field in selectors.TASK_FIELDS if field in fields],
+        None if category_fields is None else [field for field in selectors.CATEGORY_FIELDS if field in category_fields],
+    )
+
+
+def _prefers_minimal(request) -> bool:
+    """Checks whether the client asked for no response body with `Prefer: return=minimal` (RFC 7240)."""
+    preferences = request.headers.get('Prefer', '').split(',')
+    return 'return=minimal' in {preference.split(';')[0].replace(' ', '') for preference in preferences}
+
+
+def _minimal_response():
+    """Returns the `204` answer to a write made with `Prefer: return=minimal`."""
+    response = Response(status=status.HTTP_204_NO_CONTENT)
+    response['Preference-Applied'] = 'return=minimal'
+    return response
+
+
+def _scalar_patch_data(request) -> Optional[dict]:
+    """
+    Validates a PATCH that only touches scalar task fields.
+
+    Returns:
+        The validated data for `services.task_update_fields`, or None if
+        the patch needs the regular update, e.g. it changes categories.
+
+    Raises:
+        rest_framework.exceptions.ValidationError: If the data is invalid.
+    """
+    # Тело может быть и не объектом (например, массивом) - такое разбирает обычный путь
+    if not isinstance(request.data, dict) or not request.data:
+        return None
+    if not set(request.data).issubset(services.TASK_SCALAR_FIELDS):
+        return None
+
+    # Без instance и категорий валидация не обращается к БД
+    serializer = TaskApi.InputSerializer(data=request.data, partial=True, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def _uncached_response(data):
+    response = Response(data)
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+def _cached_response(request, *, namespace: str, params, fetch, cacheable: bool = True):
+    """
+    Returns cached data for the request's user with an ETag.
+
+    The ETag is derived from the user's cache version, so a matching
+    `If-None-Match` is answered with `304` before any data is loaded.
+    Data that changes without a write, e.g. with a time-dependent filter,
+    is passed with `cacheable=False` and always fetched, without an ETag.
+    """
+    if not cacheable:
+        return _uncached_response(fetch())
+
+    user_id = request.user.id
+    version = user_cache_version(user_id=user_id)
+    etag = _representation_etag(request, user_id=user_id, version=version, namespace=namespace, params=params)
+
+    # Сравнение слабое (RFC 9110), поэтому ETag, ослабленный GZip-мидлварью, тоже совпадает
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        patch_vary_headers(not_modified, ('Accept',))
+        return not_modified
+
+    data = cached_for_user(user_id=user_id, namespace=namespace, params=params, fetch=fetch, version=version)
+    response = Response(data)
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+async def _acached_response(request, *, namespace: str, params, fetch, cacheable: bool = True):
+    """Async variant of `_cached_response`; `fetch` is a coroutine factory."""
+    if not cacheable:
+        return _uncached_response(await fetch())
+
+    user_id = request.user.id
+    version = await auser_cache_version(user_id=user_id)
+    etag = _representation_etag(request, user_id=user_id, version=version, namespace=namespace, params=params)
+
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        patch_vary_headers(not_modified, ('Accept',))
+        return not_modified
+
+    data = await acached_for_user(user_id=user_id, namespace=namespace, params=params, fetch=fetch, version=version)
+    response = Response(data)
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+class UserCategoriesField(serializers.ListField):
+    """
+    A list of category IDs resolved to categories of the request's user.
+
+    All IDs are checked with a single `IN` query scoped to the user; legacy
+    string ids are accepted as well. Requires `request` in the context.
+    """
+    child = serializers.CharField(max_length=40)
+
+    def to_internal_value(self, data) -> list[Category]:
+        category_ids = super().to_internal_value(data)
+        if not category_ids:
+            return []
+
+        categories_by_id = selectors.index_by_ids(selectors.category_list_by_ids(
+            user=self.context['request'].user, category_ids=category_ids
+        ))
+        unknown = [category_id for category_id in dict.fromkeys(category_ids) if category_id not in categories_by_id]
+        if unknown:
+            raise serializers.ValidationError([f"Unknown category: {category_id}" for category_id in unknown])
+
+        # Повторы одной категории (в том числе по UUID и legacy id) схлопываются
+        categories = (categories_by_id[category_id] for category_id in category_ids)
+        return list({category.id: category for category in categories}.values())
+
+
 class CategoryApi(APIView):
     """API for managing categories."""
     permission_classes = (IsAuthenticated,)
@@ -24,10 +207,18 @@ class CategoryApi(APIView):
             fields = ('id', 'name', 'created_at', 'updated_at')
 
     def get(self, request):
-        """Retrieve a list of categories for the authenticated user."""
-        categories = selectors.category_list_for_user(user=request.user)
-        data = self.OutputSerializer(categories, many=True).data
-        return Response(data)
+        """Retrieve a cursor-paginated list of categories for the authenticated user."""
+        return _cached_response(
+            request,
+            namespace='categories',
+            params=request.query_params,
+            fetch=lambda: get_paginated_data(
+                pagination_class=KeysetPagination,
+                serializer_class=self.OutputSerializer,
+                queryset=selectors.category_list_for_user(user=request.user),
+                request=request,
+            ),
+        )
 
     def post(self, request):
         """Create a new category for the authenticated user."""
@@ -58,16 +249,28 @@ class TaskApi(APIView):
             input_formats=['%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M']
         )
         is_completed = serializers.BooleanField(required=False)
-        categories = serializers.PrimaryKeyRelatedField(
-            queryset=Category.objects.all(),
-            many=True,
-            required=False
-        )
+        categories = UserCategoriesField(required=False)
 
     class OutputSerializer(serializers.ModelSerializer):
-        """Serializer for displaying a task."""
+        """
+        Serializer for displaying a task.
+
+        `fields` and `category_fields` restrict the output to a sparse fieldset,
+        see `_sparse_fields`.
+        """
         categories = CategoryApi.OutputSerializer(many=True, read_only=True)
 
+        def __init__(self, *args, fields=None, category_fields=None, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Незапрошенные поля убираем, иначе они обратились бы к отложенным колонкам
+            if fields is not None:
+                for name in set(self.fields) - set(fields):
+                    self.fields.pop(name)
+            if category_fields is not None and 'categories' in self.fields:
+                category_serializer = self.fields['categories'].child
+                for name in set(category_serializer.fields) - set(category_fields):
+                    category_serializer.fields.pop(name)
+
         class Meta:
             model = Task
             fields = (
@@ -81,11 +284,85 @@ class TaskApi(APIView):
                 'categories'
             )
 
+    class ListOutputSerializer:
+        """
+        Builds the `OutputSerializer` representation straight from the rows of
+        `selectors.task_values_list_for_user`, without model instances or
+        field-by-field serialization. Used for the list hot path.
+        """
+        datetime_field = serializers.DateTimeField()
+        datetime_fields = ('due_date', 'created_at', 'updated_at')
+
+        def __init__(
+            self,
+            rows: list[dict],
+            many: bool = True,
+            fields: Optional[list[str]] = None,
+            category_fields: Optional[list[str]] = None,
+        ):
+            self.rows = rows
+            fields = selectors.TASK_FIELDS if fields is None else fields
+            self.category_fields = selectors.CATEGORY_FIELDS if category_fields is None else category_fields
+            # Преобразование для каждого поля выбирается один раз, а не для каждой строки
+            converters = {'id': str, **dict.fromkeys(self.datetime_fields, self.datetime_field.to_representation)}
+            self.columns = [(field, converters.get(field)) for field in fields if field != 'categories']
+            # categories в TASK_FIELDS последнее, поэтому порядок ключей сохраняется
+            self.with_categories = 'categories' in fields
+
+        @property
+        def data(self) -> list[dict]:
+            # Одни и те же категории повторяются у многих задач, форматируем каждую один раз
+            self._categories = {}
+            return [self.to_representation(row) for row in self.rows]
+
+        def category_representation(self, category: dict) -> dict:
+            key = tuple(category.values())
+            if key not in self._categories:
+                format_datetime = self.datetime_field.to_representation
+                self._categories[key] = {
+                    # Внутри JSON даты приходят строками, приводим их к формату DRF
+                    field: format_datetime(parse_datetime(category[field])) if field in self.datetime_fields
+                    else category[field]
+                    for field in self.category_fields
+                }
+            return dict(self._categories[key])
+
+        def to_representation(self, row: dict) -> dict:
+            representation = {
+                field: row[field] if convert is None else convert(row[field])
+                for field, convert in self.columns
+            }
+            if self.with_categories:
+                representation['categories'] = [
+                    self.category_representation(category) for category in row['category_list']
+                ]
+            return representation
+
     def get(self, request):
-        """Retrieve a list of tasks for the authenticated user."""
-        tasks = selectors.task_list_for_user(user=request.user)
-        data = self.OutputSerializer(tasks, many=True).data
-        return Response(data)
+        """
+        Retrieve a cursor-paginated list of tasks for the authenticated user.
+
+        Supports the filters of `todos.filters.TaskFilter` and a sparse
+        fieldset (`fields`) as query parameters.
+        """
+        fields, category_fields = _sparse_fields(request)
+        return _cached_response(
+            request,
+            namespace='tasks',
+            params=request.query_params,
+            cacheable=not TaskFilter.is_time_dependent(request.query_params),
+            fetch=lambda: get_paginated_data(
+                pagination_class=KeysetPagination,
+                serializer_class=partial(self.ListOutputSerializer, fields=fields, category_fields=category_fields),
+                queryset=selectors.task_values_list_for_user(
+                    user=request.user,
+                    filters=request.query_params,
+                    fields=fields,
+                    category_fields=category_fields,
+                ),
+                request=request,
+            ),
+        )
 
     def post(self, request):
         """Create a new task for the authenticated user."""
@@ -101,19 +378,205 @@ class TaskApi(APIView):
         return Response(data, status=status.HTTP_201_CREATED)
 
 
+class TaskBulkApi(APIView):
+    """API for creating, updating and deleting many tasks in one request."""
+    permission_classes = (IsAuthenticated,)
+
+    class CreateItemSerializer(TaskApi.InputSerializer):
+        """Serializer for one created task; categories are resolved in bulk by the service."""
+        categories = serializers.ListField(
+            child=serializers.CharField(max_length=40),
+            required=False
+        )
+
+    class UpdateItemSerializer(CreateItemSerializer):
+        """Serializer for one partially updated task."""
+        id = serializers.CharField(max_length=40)
+
+        def validate(self, attrs):
+            # partial=True делает необязательными все поля, но id нужен всегда
+            if 'id' not in attrs:
+                raise serializers.ValidationError({'id': "This field is required."})
+            return attrs
+
+    class InputSerializer(serializers.Serializer):
+        """Serializer for the bulk request envelope."""
+        create = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+        update = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+        delete = serializers.ListField(
+            child=serializers.CharField(max_length=40),
+            required=False,
+            default=list
+        )
+
+        def validate(self, attrs):
+            total = len(attrs['create']) + len(attrs['update']) + len(attrs['delete'])
+            if total > settings.TODOS_BULK_MAX_ITEMS:
+                raise serializers.ValidationError(
+                    f"At most {settings.TODOS_BULK_MAX_ITEMS} items per request, got {total}."
+                )
+            return attrs
+
+    @staticmethod
+    def _validate_items(serializer_class, items: list[dict], **kwargs) -> tuple[list, list[dict], list[int]]:
+        """
+        Validates items one by one.
+
+        Returns the result list with errors filled in for invalid items,
+        the validated data of the valid items and their positions.
+        """
+        results = [None] * len(items)
+        valid, positions = [], []
+        for position, item in enumerate(items):
+            serializer = serializer_class(data=item, **kwargs)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+                positions.append(position)
+            else:
+                result = {'id': item['id']} if 'id' in item else {}
+                results[position] = {**result, 'status': 'invalid', 'errors': serializer.errors}
+        return results, valid, positions
+
+    def post(self, request):
+        """
+        Apply `create`, `update` and `delete` arrays in one transaction.
+
+        Responds with a per-item result for every array, in input order.
+        """
+        serializer = self.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        create_results, creates, create_positions = self._validate_items(
+            self.CreateItemSerializer, serializer.validated_data['create']
+        )
+        update_results, updates, update_positions = self._validate_items(
+            self.UpdateItemSerializer, serializer.validated_data['update'], partial=True
+        )
+
+        applied = services.task_bulk_apply(
+            user=request.user,
+            creates=creates,
+            updates=updates,
+            deletes=serializer.validated_data['delete'],
+        )
+        for position, result in zip(create_positions, applied['create']):
+            create_results[position] = result
+        for position, result in zip(update_positions, applied['update']):
+            update_results[position] = result
+
+        return Response({
+            'create': create_results,
+            'update': update_results,
+            'delete': applied['delete'],
+        })
+
+
+def _require_task_filters(request) -> None:
+    """
+    Validates the `TaskFilter` query parameters of a filter-scoped action.
+
+    At least one filter is required, so that a bare request cannot touch
+    every task of the user.
+
+    Raises:
+        rest_framework.exceptions.ValidationError: If the filters are invalid or missing.
+    """
+    filterset = TaskFilter(request.query_params)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    if not filterset.has_active_filters():
+        raise serializers.ValidationError("At least one filter is required.")
+
+
+class TaskCompleteActionApi(APIView):
+    """API marking every task matching the filters as completed."""
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        """
+        Complete all open tasks matching the `TaskFilter` query parameters.
+
+        At least one filter is required. Responds with the number of affected tasks.
+        """
+        _require_task_filters(request)
+        affected = services.task_complete_by_filter(user=request.user, filters=request.query_params)
+        return Response({'affected': affected})
+
+
+class TaskDeleteActionApi(APIView):
+    """API deleting every task matching the filters."""
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        """
+        Delete all tasks matching the `TaskFilter` query parameters.
+
+        At least one filter is required. Responds with the number of affected tasks.
+        """
+        _require_task_filters(request)
+        affected = services.task_delete_by_filter(user=request.user, filters=request.query_params)
+        return Response({'affected': affected})
+
+
+class TaskMoveCategoryActionApi(APIView):
+    """API moving every task matching the filters from one category to another."""
+    permission_classes = (IsAuthenticated,)
+
+    class InputSerializer(serializers.Serializer):
+        """Serializer for the source and target categories."""
+        from_category = serializers.CharField(max_length=40)
+        to_category = serializers.CharField(max_length=40)
+
+    def post(self, request):
+        """
+        Move tasks matching the `TaskFilter` query parameters between categories.
+
+        Responds with the number of affected tasks.
+        """
+        serializer = self.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        from_category = get_object_or_404(selectors.category_list_by_ids(
+            user=request.user, category_ids=[serializer.validated_data['from_category']]
+        ))
+        to_category = get_object_or_404(selectors.category_list_by_ids(
+            user=request.user, category_ids=[serializer.validated_data['to_category']]
+        ))
+        affected = services.task_move_category_by_filter(
+            user=request.user,
+            filters=request.query_params,
+            from_category=from_category,
+            to_category=to_category,
+        )
+        return Response({'affected': affected})
+
+
 class TaskDetailApi(APIView):
     """API for a single task."""
     permission_classes = (IsAuthenticated,)
 
-    def get_task(self, user, task_id):
-        """Helper to get a task ensuring it belongs to the user."""
-        return get_object_or_404(Task, id=task_id, user=user)
+    def get_task(self, user, task_id, fields=None, category_fields=None):
+        """Helper to get a task ensuring it belongs to the user; accepts legacy string ids."""
+        task = selectors.task_get_for_user(
+            user=user, task_id=task_id, fields=fields, category_fields=category_fields
+        )
+        if task is None:
+            raise Http404
+        return task
 
     def get(self, request, task_id: str):
-        """Retrieve a single task."""
-        task = self.get_task(request.user, task_id)
-        data = TaskApi.OutputSerializer(task).data
-        return Response(data)
+        """Retrieve a single task; supports a sparse fieldset (`fields`)."""
+        fields, category_fields = _sparse_fields(request)
+        return _cached_response(
+            request,
+            namespace='task',
+            params={'id': task_id, 'fields': request.query_params.get('fields', '')},
+            fetch=lambda: TaskApi.OutputSerializer(
+                self.get_task(request.user, task_id, fields, category_fields),
+                fields=fields,
+                category_fields=category_fields,
+            ).data,
+        )
 
     def put(self, request, task_id: str):
         """Update a single task."""
@@ -129,11 +592,27 @@ class TaskDetailApi(APIView):
     def delete(self, request, task_id: str):
         """Delete a single task."""
         task = self.get_task(request.user, task_id)
-        task.delete()
+        services.task_delete(task=task)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def patch(self, request, task_id: str):
-        """Partially update a single task."""
+        """
+        Partially update a single task.
+
+        A patch of scalar fields only is applied with a single `UPDATE`,
+        without loading the task first. With `Prefer: return=minimal` the
+        response is `204` without a body.
+        """
+        minimal = _prefers_minimal(request)
+        scalar_data = _scalar_patch_data(request)
+        if scalar_data is not None:
+            row = services.task_update_fields(
+                user=request.user, task_id=task_id, data=scalar_data, returning=not minimal
+            )
+            if row is None:
+                raise Http404
+            return _minimal_response() if minimal else Response(TaskApi.ListOutputSerializer([row]).data[0])
+
         task = self.get_task(request.user, task_id)
         # partial=True говорит сериализатору, что мы обновляем только часть полей
         serializer = TaskApi.InputSerializer(
@@ -141,5 +620,158 @@ class TaskDetailApi(APIView):
         )
         serializer.is_valid(raise_exception=True)
         updated_task = services.task_update(task=task, data=serializer.validated_data)
+        if minimal:
+            return _minimal_response()
+        data = TaskApi.OutputSerializer(updated_task).data
+        return Response(data)
+
+
+# Асинхронные варианты основных API для запуска под ASGI (см. настройку API_ASYNC_VIEWS).
+# Запросы к БД и кэшу не занимают воркер, пока ждут ответа. Сериализаторы остаются
+# синхронными, поэтому связанные объекты выбираются заранее, а валидация с запросами
+# к БД выполняется в потоке
+
+
+class CategoryAsyncApi(AsyncAPIView):
+    """Async variant of `CategoryApi`."""
+    permission_classes = (IsAuthenticated,)
+
+    async def get(self, request):
+        """Retrieve a cursor-paginated list of categories for the authenticated user."""
+        return await _acached_response(
+            request,
+            namespace='categories',
+            params=request.query_params,
+            fetch=lambda: aget_paginated_data(
+                pagination_class=KeysetPagination,
+                serializer_class=CategoryApi.OutputSerializer,
+                queryset=selectors.category_list_for_user(user=request.user),
+                request=request,
+            ),
+        )
+
+    async def post(self, request):
+        """Create a new category for the authenticated user."""
+        serializer = CategoryApi.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        category = await services.acategory_create(
+            user=request.user, **serializer.validated_data
+        )
+
+        data = CategoryApi.OutputSerializer(category).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class TaskAsyncApi(AsyncAPIView):
+    """Async variant of `TaskApi`."""
+    permission_classes = (IsAuthenticated,)
+
+    async def get(self, request):
+        """
+        Retrieve a cursor-paginated list of tasks for the authenticated user.
+
+        Supports the filters of `todos.filters.TaskFilter` and a sparse
+        fieldset (`fields`) as query parameters.
+        """
+        fields, category_fields = _sparse_fields(request)
+        return await _acached_response(
+            request,
+            namespace='tasks',
+            params=request.query_params,
+            cacheable=not TaskFilter.is_time_dependent(request.query_params),
+            fetch=lambda: aget_paginated_data(
+                pagination_class=KeysetPagination,
+                serializer_class=partial(TaskApi.ListOutputSerializer, fields=fields, category_fields=category_fields),
+                queryset=selectors.task_values_list_for_user(
+                    user=request.user,
+                    filters=request.query_params,
+                    fields=fields,
+                    category_fields=category_fields,
+                ),
+                request=request,
+            ),
+        )
+
+    async def post(self, request):
+        """Create a new task for the authenticated user."""
+        serializer = TaskApi.InputSerializer(
+            data=request.data, context={'request': request}
+        )
+        # Проверка категорий обращается к БД
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+
+        task = await services.atask_create(
+            user=request.user, **serializer.validated_data
+        )
+        data = TaskApi.OutputSerializer(task).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class TaskDetailAsyncApi(AsyncAPIView):
+    """Async variant of `TaskDetailApi`."""
+    permission_classes = (IsAuthenticated,)
+
+    async def get_task(self, user, task_id, fields=None, category_fields=None):
+        """Helper to get a task ensuring it belongs to the user; accepts legacy string ids."""
+        task = await selectors.atask_get_for_user(
+            user=user, task_id=task_id, fields=fields, category_fields=category_fields
+        )
+        if task is None:
+            raise Http404
+        return task
+
+    async def get(self, request, task_id: str):
+        """Retrieve a single task; supports a sparse fieldset (`fields`)."""
+        fields, category_fields = _sparse_fields(request)
+
+        async def fetch():
+            task = await self.get_task(request.user, task_id, fields, category_fields)
+            return TaskApi.OutputSerializer(task, fields=fields, category_fields=category_fields).data
+
+        return await _acached_response(
+            request,
+            namespace='task',
+            params={'id': task_id, 'fields': request.query_params.get('fields', '')},
+            fetch=fetch,
+        )
+
+    async def put(self, request, task_id: str):
+        """Update a single task."""
+        task = await self.get_task(request.user, task_id)
+        serializer = TaskApi.InputSerializer(
+            data=request.data, context={'request': request}
+        )
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        updated_task = await services.atask_update(task=task, data=serializer.validated_data)
         data = TaskApi.OutputSerializer(updated_task).data
-        return Response(data)
\ No newline at end of file
+        return Response(data)
+
+    async def delete(self, request, task_id: str):
+        """Delete a single task."""
+        task = await self.get_task(request.user, task_id)
+        await services.atask_delete(task=task)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    async def patch(self, request, task_id: str):
+        """Partially update a single task; see `TaskDetailApi.patch`."""
+        minimal = _prefers_minimal(request)
+        scalar_data = _scalar_patch_data(request)
+        if scalar_data is not None:
+            row = await services.atask_update_fields(
+                user=request.user, task_id=task_id, data=scalar_data, returning=not minimal
+            )
+            if row is None:
+                raise Http404
+            return _minimal_response() if minimal else Response(TaskApi.ListOutputSerializer([row]).data[0])
+
+        task = await self.get_task(request.user, task_id)
+        serializer = TaskApi.InputSerializer(
+            instance=task, data=request.data, partial=True, context={'request': request}
+        )
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        updated_task = await services.atask_update(task=task, data=serializer.validated_data)
+        if minimal:
+            return _minimal_response()
+        data = TaskApi.OutputSerializer(updated_task).data
+        return Response(data)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TodosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todos'
+
+    def ready(self):
+        # Регистрируем обработчики инвалидации кэша задач
+        from todos import signals  # noqa: F401
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from common.metrics import metric_incr
+
+
+VERSION_KEY_PREFIX = 'todos:version:'
+DATA_KEY_PREFIX = 'todos:data:'
+
+
+def _version_key(user_id: int) -> str:
+    return f"{VERSION_KEY_PREFIX}{user_id}"
+
+
+def _params_hash(params: Mapping) -> str:
+    """Returns a stable hash of query parameters, independent of their order."""
+    if hasattr(params, 'lists'):
+        items = sorted((key, sorted(values)) for key, values in params.lists())
+    else:
+        items = sorted((key, str(value)) for key, value in params.items())
+
+    payload = json.dumps(items, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def user_cache_version(*, user_id: int) -> int:
+    """
+    Returns the current version of a user's cached todos data.
+
+    Every write bumps the version, so keys built from an older version are
+    never read again. A missing version starts from the current time in
+    nanoseconds, so it never repeats a version that was evicted.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        int: The version number.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_user_cache_version(*, user_id: int) -> None:
+    """
+    Makes every cached todos entry of a user stale.
+
+    Args:
+        user_id (int): The ID of the user whose data has changed.
+    """
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_user_cache(*, user_id: int) -> None:
+    """
+    Bumps the user's cache version once the current transaction commits.
+
+    Saves and deletes of tasks and categories call this from signal
+    receivers, see `todos.signals`; writes that bypass signals, such as
+    `QuerySet.update()`, bulk operations and raw SQL, must call it
+    themselves. Outside a transaction the version is bumped immediately.
+
+    Args:
+        user_id (int): The ID of the user whose data has changed.
+    """
+    transaction.on_commit(lambda: bump_user_cache_version(user_id=user_id))
+
+
+async def auser_cache_version(*, user_id: int) -> int:
+    """Async variant of `user_cache_version`."""
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+
+    return version
+
+
+def _data_key(*, user_id: int, namespace: str, params: Mapping, version: int) -> str:
+    return f"{DATA_KEY_PREFIX}{namespace}:{user_id}:{version}:{_params_hash(params)}"
+
+
+def user_data_etag(*, user_id: int, version: int, namespace: str, params: Mapping) -> str:
+    """
+    Returns a strong ETag for a user's data without loading or serializing it.
+
+    The ETag changes whenever the user's cache version is bumped by a write.
+
+    Args:
+        user_id (int): The ID of the user owning the data.
+        version (int): The user's cache version, see `user_cache_version`.
+        namespace (str): The kind of data, e.g. `tasks` or `task`.
+        params (Mapping): Parameters the data depends on, e.g. query params.
+
+    Returns:
+        str: A quoted entity tag.
+    """
+    return f'"{user_id}-{version:x}-{namespace}-{_params_hash(params)}"'
+
+
+def cached_for_user(
+    *,
+    user_id: int,
+    namespace: str,
+    params: Mapping,
+    fetch: Callable[[], Any],
+    version: Optional[int] = None,
+) -> Any:
+    """
+    Returns cached data for a user, computing and storing it on a miss.
+
+    Args:
+        user_id (int): The ID of the user owning the data.
+        namespace (str): The kind of data, e.g. `tasks` or `task`.
+        params (Mapping): Parameters the data depends on, e.g. query params.
+        fetch (Callable): Computes the data on a cache miss; exceptions are not cached.
+        version (int, optional): The user's cache version if already known.
+
+    Returns:
+        The cached or freshly computed data.
+    """
+    if version is None:
+        version = user_cache_version(user_id=user_id)
+    key = _data_key(user_id=user_id, namespace=namespace, params=params, version=version)
+
+    data = cache.get(key)
+    if data is not None:
+        metric_incr('todos_cache.hit')
+        return data
+
+    metric_incr('todos_cache.miss')
+    data = fetch()
+    cache.set(key, data, settings.TODOS_CACHE_TTL)
+    return data
+
+
+async def acached_for_user(
+    *,
+    user_id: int,
+    namespace: str,
+    params: Mapping,
+    fetch: Callable[[], Awaitable[Any]],
+    version: Optional[int] = None,
+) -> Any:
+    """Async variant of `cached_for_user`; `fetch` is a coroutine factory."""
+    if version is None:
+        version = await auser_cache_version(user_id=user_id)
+    key = _data_key(user_id=user_id, namespace=namespace, params=params, version=version)
+
+    data = await cache.aget(key)
+    if data is not None:
+        metric_incr('todos_cache.hit')
+        return data
+
+    metric_incr('todos_cache.miss')
+    data = await fetch()
+    await cache.aset(key, data, settings.TODOS_CACHE_TTL)
+    return data
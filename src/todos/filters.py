@@ -0,0 +1,61 @@
+import django_filters
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from todos.models import Task
+
+
+class UUIDInFilter(django_filters.BaseInFilter, django_filters.UUIDFilter):
+    """Filter accepting a comma-separated list of UUIDs."""
+    pass
+
+
+class TaskFilter(django_filters.FilterSet):
+    """
+    Server-side filters for the task list.
+
+    Every filter shape here is backed by an index on `Task` so that, for
+    example, "open tasks due this week" is an index range scan.
+    """
+    is_completed = django_filters.BooleanFilter(field_name='is_completed')
+    due_after = django_filters.IsoDateTimeFilter(field_name='due_date', lookup_expr='gte')
+    due_before = django_filters.IsoDateTimeFilter(field_name='due_date', lookup_expr='lt')
+    updated_before = django_filters.IsoDateTimeFilter(field_name='updated_at', lookup_expr='lt')
+    category = UUIDInFilter(field_name='categories__id', distinct=True)
+    overdue = django_filters.BooleanFilter(method='filter_overdue')
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ('due_date', 'due_date'),
+            ('created_at', 'created_at'),
+        ),
+    )
+
+    class Meta:
+        model = Task
+        fields = ('is_completed', 'due_after', 'due_before', 'updated_before', 'category', 'overdue')
+
+    # Фильтры, результат которых меняется со временем без единой записи в БД
+    time_dependent_filters = ('overdue',)
+
+    @classmethod
+    def is_time_dependent(cls, params) -> bool:
+        """Checks whether the params use a filter whose result changes over time, so it cannot be cached."""
+        return any(params.get(name) not in (None, '') for name in cls.time_dependent_filters)
+
+    def has_active_filters(self) -> bool:
+        """Checks whether any filter other than `ordering` narrows the queryset."""
+        return any(
+            value not in (None, '', [])
+            for name, value in self.form.cleaned_data.items()
+            if name != 'ordering'
+        )
+
+    def filter_overdue(self, queryset: QuerySet[Task], name: str, value: bool) -> QuerySet[Task]:
+        """Keeps only open tasks whose due date has already passed."""
+        if value is None:
+            return queryset
+
+        overdue = {'is_completed': False, 'due_date__lt': timezone.now()}
+        if value:
+            return queryset.filter(**overdue)
+        return queryset.exclude(**overdue)
@@ -0,0 +1,84 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+
+BENCH_TELEGRAM_ID_BASE = 9_000_000_000
+
+
+class Command(BaseCommand):
+    """
+    Load-tests a running backend with bot-like traffic.
+
+    Every simulated bot user authenticates, then repeatedly lists tasks,
+    creates a task, opens it and marks it completed, with `--concurrency`
+    users in flight at once. Run it against the WSGI (gunicorn) and ASGI
+    (uvicorn, `API_ASYNC_VIEWS=True`) servers to compare them. The bench
+    users are deleted afterwards.
+    """
+    help = "Benchmark a running backend under concurrent bot traffic."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000/api/v1', help="API root of the server.")
+        parser.add_argument('--concurrency', type=int, default=50, help="Simultaneous bot users.")
+        parser.add_argument('--rounds', type=int, default=5, help="Request rounds per user.")
+
+    def handle(self, *args, **options):
+        try:
+            latencies, errors, elapsed = asyncio.run(self._run(**options))
+        finally:
+            User.objects.filter(
+                telegram_profile__telegram_id__gte=BENCH_TELEGRAM_ID_BASE,
+                telegram_profile__telegram_id__lt=BENCH_TELEGRAM_ID_BASE + options['concurrency'],
+            ).delete()
+
+        if not latencies:
+            self.stdout.write(f"No successful requests, {errors} errors.")
+            return
+
+        quantiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s), "
+            f"{errors} errors, latency p50 {quantiles[49] * 1000:.0f}ms, "
+            f"p95 {quantiles[94] * 1000:.0f}ms, p99 {quantiles[98] * 1000:.0f}ms"
+        )
+
+    async def _run(self, *, base_url, concurrency, rounds, **options):
+        latencies, errors = [], 0
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            async def request(method, url, **kwargs):
+                nonlocal errors
+                started = time.monotonic()
+                response = await client.request(method, url, **kwargs)
+                if response.is_success:
+                    latencies.append(time.monotonic() - started)
+                else:
+                    errors += 1
+                return response
+
+            async def bot_user(number):
+                response = await request('POST', '/users/auth/telegram/', json={
+                    'telegram_id': BENCH_TELEGRAM_ID_BASE + number, 'username': f"bench{number}",
+                })
+                headers = {'Authorization': f"Token {response.json()['token']}"}
+
+                for i in range(rounds):
+                    await request('GET', '/tasks/', headers=headers)
+                    response = await request('POST', '/tasks/', headers=headers, json={
+                        'title': f"bench {i}", 'due_date': '2030-01-01 12:00',
+                    })
+                    task_url = f"/tasks/{response.json()['id']}/"
+                    await request('GET', task_url, headers=headers)
+                    await request('PATCH', task_url, headers=headers, json={'is_completed': True})
+
+            started = time.monotonic()
+            await asyncio.gather(*(bot_user(number) for number in range(concurrency)))
+            elapsed = time.monotonic() - started
+
+        return latencies, errors, elapsed
@@ -0,0 +1,46 @@
+import time
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from todos.notifications import close_client, deliver_notifications
+
+
+class Command(BaseCommand):
+    """
+    Measures per-worker notification throughput against the bot's webhook.
+
+    Compares the old delivery (a fresh synchronous client per message to
+    `/notify`) with the pooled batched delivery used by the Celery worker.
+    """
+    help = "Benchmark notification delivery throughput to the bot webhook."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=500, help="Number of notifications to send.")
+        parser.add_argument('--telegram-id', type=int, required=True, help="Chat that receives the test messages.")
+
+    def handle(self, *args, **options):
+        count = options['count']
+        payloads = [
+            {"telegram_id": options['telegram_id'], "message": f"Benchmark notification #{i}"}
+            for i in range(count)
+        ]
+
+        started = time.monotonic()
+        for payload in payloads:
+            with httpx.Client() as client:
+                client.post(settings.BOT_WEBHOOK_URL, json=payload)
+        self._report("client per message", count, time.monotonic() - started)
+
+        started = time.monotonic()
+        errors = deliver_notifications(payloads)
+        self._report("pooled batched", count, time.monotonic() - started)
+        close_client()
+
+        failed = sum(1 for error in errors if error is not None)
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} pooled deliveries failed."))
+
+    def _report(self, name: str, count: int, elapsed: float):
+        self.stdout.write(f"{name:>20}: {count} in {elapsed:.2f}s, {count / elapsed:.1f} msg/s")
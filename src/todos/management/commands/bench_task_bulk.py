@@ -0,0 +1,85 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from todos import services
+from todos.models import Task
+
+
+BENCH_USERNAME = 'bench_task_bulk'
+
+
+class Command(BaseCommand):
+    """
+    Compares per-item task services with `task_bulk_apply`.
+
+    Each round creates, updates and deletes `count` tasks of a throwaway
+    user, first one service call (and transaction) per task, then in a
+    single bulk call. The user is deleted afterwards.
+    """
+    help = "Benchmark bulk task create/update/delete against the per-item loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, nargs='+', default=[1000, 10000], help="Items per round.")
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        category = services.category_create(user=user, name='bench')
+        due_date = timezone.now() + timezone.timedelta(days=1)
+
+        try:
+            for count in options['count']:
+                self.stdout.write(f"--- {count} items")
+                self._bench_loop(user, category, due_date, count)
+                self._bench_bulk(user, category, due_date, count)
+        finally:
+            user.delete()
+
+    def _bench_loop(self, user, category, due_date, count):
+        started = time.monotonic()
+        tasks = [
+            services.task_create(user=user, title=f"loop {i}", due_date=due_date, categories=[category])
+            for i in range(count)
+        ]
+        self._report("loop create", count, started)
+
+        started = time.monotonic()
+        for task in tasks:
+            services.task_update(task=task, data={'is_completed': True})
+        self._report("loop update", count, started)
+
+        started = time.monotonic()
+        for task in tasks:
+            services.task_delete(task=task)
+        self._report("loop delete", count, started)
+
+    def _bench_bulk(self, user, category, due_date, count):
+        creates = [
+            {'title': f"bulk {i}", 'due_date': due_date, 'categories': [category.id]}
+            for i in range(count)
+        ]
+        started = time.monotonic()
+        result = services.task_bulk_apply(user=user, creates=creates, updates=[], deletes=[])
+        self._report("bulk create", count, started)
+
+        task_ids = [item['id'] for item in result['create']]
+        started = time.monotonic()
+        services.task_bulk_apply(
+            user=user,
+            creates=[],
+            updates=[{'id': task_id, 'is_completed': True} for task_id in task_ids],
+            deletes=[],
+        )
+        self._report("bulk update", count, started)
+
+        started = time.monotonic()
+        services.task_bulk_apply(user=user, creates=[], updates=[], deletes=task_ids)
+        self._report("bulk delete", count, started)
+
+        assert not Task.objects.filter(user=user).exists()
+
+    def _report(self, name: str, count: int, started: float):
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"{name:>12}: {elapsed:.2f}s, {count / elapsed:.0f} items/s")
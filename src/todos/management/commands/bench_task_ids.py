@@ -0,0 +1,77 @@
+import hashlib
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from common.utils import uuid7
+
+
+class Command(BaseCommand):
+    """
+    Compares SHA-1 hex primary keys with native UUIDv7 ones.
+
+    Rows shaped like `todos_task` keys (id, user, created_at, with the
+    keyset index) are inserted in batches into two temporary tables, one
+    per id scheme, and the insert time and index sizes are reported.
+    Requires PostgreSQL.
+    """
+    help = "Benchmark insert throughput and index size of task primary key schemes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200_000, help="Rows per scheme.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows per INSERT.")
+        parser.add_argument('--users', type=int, default=1000, help="Distinct owners of the rows.")
+
+    def handle(self, *args, **options):
+        schemes = (
+            ('sha1', 'varchar(40)', self._sha1_id),
+            ('uuid7', 'uuid', lambda user_id, title: str(uuid7())),
+        )
+        with transaction.atomic():
+            for name, column_type, make_id in schemes:
+                self._bench(name, column_type, make_id, options)
+            # Временные таблицы удаляются вместе с откатом транзакции
+            transaction.set_rollback(True)
+
+    def _sha1_id(self, user_id: int, title: str) -> str:
+        # Повторяет прежнюю схему services._generate_hash_id
+        creation_string = f"{user_id}:{title}:{timezone.now().isoformat()}"
+        return hashlib.sha1(creation_string.encode('utf-8')).hexdigest()
+
+    def _bench(self, name, column_type, make_id, options):
+        table = f"bench_ids_{name}"
+        count, batch_size = options['count'], options['batch_size']
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE {table} ("
+                f"id {column_type} PRIMARY KEY, user_id integer NOT NULL, created_at timestamptz NOT NULL)"
+            )
+            cursor.execute(f"CREATE INDEX {table}_user_created ON {table} (user_id, created_at DESC, id)")
+
+            started = time.monotonic()
+            for offset in range(0, count, batch_size):
+                size = min(batch_size, count - offset)
+                user_ids = [random.randint(1, options['users']) for _ in range(size)]
+                ids = [make_id(user_id, f"task {offset + i}") for i, user_id in enumerate(user_ids)]
+                cursor.execute(
+                    f"INSERT INTO {table} (id, user_id, created_at) "
+                    f"SELECT unnest(%s::text[])::{column_type}, unnest(%s::int[]), now()",
+                    [ids, user_ids],
+                )
+            elapsed = time.monotonic() - started
+
+            cursor.execute(
+                "SELECT pg_relation_size(%s), pg_relation_size(%s), pg_relation_size(%s)",
+                [table, f"{table}_pkey", f"{table}_user_created"],
+            )
+            table_size, pk_size, keyset_size = cursor.fetchone()
+
+        self.stdout.write(
+            f"{name:>6}: {count} rows in {elapsed:.2f}s ({count / elapsed:.0f} rows/s), "
+            f"table {table_size / 2**20:.1f} MiB, pkey {pk_size / 2**20:.1f} MiB, "
+            f"keyset index {keyset_size / 2**20:.1f} MiB"
+        )
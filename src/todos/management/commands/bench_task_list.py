@@ -0,0 +1,82 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from todos import selectors
+from todos.apis import TaskApi
+from todos.models import Category, Task
+
+
+BENCH_USERNAME = 'bench_task_list'
+
+
+class Command(BaseCommand):
+    """
+    Compares the task list serializers.
+
+    For every count a throwaway user gets that many tasks with two
+    categories each, and the whole list is read and serialized with
+    `TaskApi.OutputSerializer` (model instances plus a categories prefetch)
+    and with `TaskApi.ListOutputSerializer` (one `values()` query with the
+    categories aggregated into JSON). Both outputs are checked to be equal.
+    """
+    help = "Benchmark the values() projection of the task list against the model serializer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, nargs='+', default=[1000, 10000], help="Tasks per round.")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per serializer; the best one is reported.")
+
+    def handle(self, *args, **options):
+        for count in options['count']:
+            user, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+            try:
+                self._populate(user, count)
+                self.stdout.write(f"--- {count} tasks")
+                serializer_data = self._bench(
+                    "serializer", options['repeat'],
+                    lambda: TaskApi.OutputSerializer(list(selectors.task_list_for_user(user=user)), many=True).data,
+                )
+                projection_data = self._bench(
+                    "projection", options['repeat'],
+                    lambda: TaskApi.ListOutputSerializer(list(selectors.task_values_list_for_user(user=user))).data,
+                )
+                self.stdout.write(f"identical output: {self._normalize(serializer_data) == projection_data}")
+            finally:
+                user.delete()
+
+    def _populate(self, user, count):
+        categories = Category.objects.bulk_create([Category(user=user, name=f"bench {i}") for i in range(2)])
+        due_date = timezone.now() + timezone.timedelta(days=1)
+        tasks = Task.objects.bulk_create(
+            [Task(user=user, title=f"task {i}", description="x" * 200, due_date=due_date) for i in range(count)],
+            batch_size=1000,
+        )
+        Task.categories.through.objects.bulk_create(
+            [
+                Task.categories.through(task_id=task.id, category_id=category.id)
+                for task in tasks for category in categories
+            ],
+            batch_size=1000,
+        )
+
+    def _bench(self, name, repeat, read):
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.monotonic()
+                data = read()
+                timings.append(time.monotonic() - started)
+
+        self.stdout.write(f"{name:>10}: {min(timings) * 1000:.0f}ms, {len(queries)} queries")
+        return data
+
+    def _normalize(self, data):
+        # Порядок категорий у prefetch не задан, а в проекции они упорядочены по дате создания
+        return [
+            {**task, 'categories': sorted(task['categories'], key=lambda c: (c['created_at'], c['id']))}
+            for task in data
+        ]
@@ -0,0 +1,70 @@
+import json
+import time
+
+import msgpack
+import orjson
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from common.renderers import MessagePackRenderer, ORJSONRenderer
+from todos import selectors
+from todos.apis import TaskApi
+from todos.management.commands.bench_task_list import Command as BenchTaskListCommand
+
+
+BENCH_USERNAME = 'bench_task_renderers'
+
+
+class Command(BaseCommand):
+    """
+    Compares response formats for a `/tasks/` page.
+
+    A throwaway user gets `--tasks` tasks with two categories each; the
+    page is rendered with DRF's `JSONRenderer`, `ORJSONRenderer` and
+    `MessagePackRenderer`. Reported per request: render CPU, body size
+    before and after gzip, gzip CPU and the client's decode CPU.
+    """
+    help = "Benchmark /tasks/ response renderers and gzip."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, nargs='+', default=[50, 200], help="Tasks per page.")
+        parser.add_argument('--repeat', type=int, default=200, help="Renders per format.")
+
+    def handle(self, *args, **options):
+        formats = (
+            ('drf json', JSONRenderer(), json.loads),
+            ('orjson', ORJSONRenderer(), orjson.loads),
+            ('msgpack', MessagePackRenderer(), msgpack.unpackb),
+        )
+        for count in options['tasks']:
+            user, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+            try:
+                BenchTaskListCommand()._populate(user, count)
+                rows = list(selectors.task_values_list_for_user(user=user))
+                data = {'next': None, 'results': TaskApi.ListOutputSerializer(rows).data}
+            finally:
+                user.delete()
+
+            self.stdout.write(f"--- page of {count} tasks")
+            for name, renderer, decode in formats:
+                self._bench(name, renderer, decode, data, options['repeat'])
+
+    def _bench(self, name, renderer, decode, data, repeat):
+        body = renderer.render(data)
+        render_cpu = self._cpu(lambda: renderer.render(data), repeat)
+        gzip_cpu = self._cpu(lambda: compress_string(body), repeat)
+        decode_cpu = self._cpu(lambda: decode(body), repeat)
+
+        self.stdout.write(
+            f"{name:>8}: render {render_cpu * 1e6:.0f}us, {len(body)} B, "
+            f"gzip {len(compress_string(body))} B in {gzip_cpu * 1e6:.0f}us, "
+            f"client decode {decode_cpu * 1e6:.0f}us"
+        )
+
+    def _cpu(self, func, repeat) -> float:
+        started = time.process_time()
+        for _ in range(repeat):
+            func()
+        return (time.process_time() - started) / repeat
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='id',
+            field=models.CharField(editable=False, max_length=40, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='id',
+            field=models.CharField(editable=False, max_length=40, primary_key=True, serialize=False),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='category_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='task_user_created_idx'),
+        ),
+    ]
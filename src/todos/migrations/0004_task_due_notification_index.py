@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0003_task_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False), ('notification_sent', False)), fields=['due_date'], name='task_due_notification_idx'),
+        ),
+    ]
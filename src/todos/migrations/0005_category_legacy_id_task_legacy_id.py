@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0004_task_due_notification_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='legacy_id',
+            field=models.CharField(blank=True, editable=False, max_length=40, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='legacy_id',
+            field=models.CharField(blank=True, editable=False, max_length=40, null=True, unique=True),
+        ),
+    ]
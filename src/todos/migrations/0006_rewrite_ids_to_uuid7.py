@@ -0,0 +1,87 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:39
+
+from django.db import migrations
+
+from common.utils import uuid7
+
+# Сколько пар (старый id, новый id) вставляется в таблицу соответствий одним запросом
+MAPPING_BATCH_SIZE = 10_000
+
+
+def _is_uuid(value: str) -> bool:
+    return len(value) == 36 and value.count('-') == 4
+
+
+def rewrite_ids_to_uuid7(apps, schema_editor):
+    """
+    Replaces SHA-1 ids with UUIDv7 strings built from `created_at`, keeping
+    the old id in `legacy_id` and repointing the M2M through rows.
+
+    New ids are computed in Python and loaded into a temporary mapping
+    table in batches; rows and through rows are then rewritten with one
+    `UPDATE ... FROM` per table. Foreign keys are `DEFERRABLE INITIALLY
+    DEFERRED`, so parents and through rows may be rewritten one after
+    another in this transaction.
+    """
+    Category = apps.get_model('todos', 'Category')
+    Task = apps.get_model('todos', 'Task')
+    through_table = schema_editor.quote_name(Task.categories.through._meta.db_table)
+
+    for model, through_field in ((Category, 'category_id'), (Task, 'task_id')):
+        table = schema_editor.quote_name(model._meta.db_table)
+        mapping = [
+            (old_id, str(uuid7(timestamp_ms=int(created_at.timestamp() * 1000))))
+            for old_id, created_at in model.objects.values_list('id', 'created_at').order_by('created_at')
+            if not _is_uuid(old_id)
+        ]
+        if not mapping:
+            continue
+
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMPORARY TABLE todos_id_mapping (old_id varchar(40) PRIMARY KEY, new_id varchar(40) NOT NULL)'
+            )
+            for i in range(0, len(mapping), MAPPING_BATCH_SIZE):
+                old_ids, new_ids = zip(*mapping[i:i + MAPPING_BATCH_SIZE])
+                cursor.execute(
+                    'INSERT INTO todos_id_mapping (old_id, new_id) SELECT * FROM unnest(%s::varchar[], %s::varchar[])',
+                    [list(old_ids), list(new_ids)],
+                )
+            cursor.execute(
+                f'UPDATE {table} SET legacy_id = {table}.id, id = m.new_id '
+                f'FROM todos_id_mapping m WHERE {table}.id = m.old_id'
+            )
+            cursor.execute(
+                f'UPDATE {through_table} SET {through_field} = m.new_id '
+                f'FROM todos_id_mapping m WHERE {through_table}.{through_field} = m.old_id'
+            )
+            cursor.execute('DROP TABLE todos_id_mapping')
+
+
+def restore_legacy_ids(apps, schema_editor):
+    """Puts the SHA-1 ids back for rows that still remember them."""
+    Category = apps.get_model('todos', 'Category')
+    Task = apps.get_model('todos', 'Task')
+    through_table = schema_editor.quote_name(Task.categories.through._meta.db_table)
+
+    for model, through_field in ((Category, 'category_id'), (Task, 'task_id')):
+        table = schema_editor.quote_name(model._meta.db_table)
+        # Сначала связи: они ссылаются на текущие id, которые переписываются следом
+        schema_editor.execute(
+            f'UPDATE {through_table} SET {through_field} = t.legacy_id '
+            f'FROM {table} t WHERE {through_table}.{through_field} = t.id AND t.legacy_id IS NOT NULL'
+        )
+        schema_editor.execute(
+            f'UPDATE {table} SET id = legacy_id, legacy_id = NULL WHERE legacy_id IS NOT NULL'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0005_category_legacy_id_task_legacy_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(rewrite_ids_to_uuid7, restore_legacy_ids),
+    ]
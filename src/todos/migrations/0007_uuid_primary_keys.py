@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:39
+
+import common.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0006_rewrite_ids_to_uuid7'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='id',
+            field=models.UUIDField(default=common.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='id',
+            field=models.UUIDField(default=common.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 
 from common.models import BaseModel
+from common.utils import uuid7
 
 
 class Category(BaseModel):
@@ -9,13 +10,21 @@ class Category(BaseModel):
     Represents a category (or tag) for a task.
 
     Attributes:
-        id (CharField): The primary key, a 64-character hash.
+        id (UUIDField): The primary key, a time-ordered UUIDv7.
+        legacy_id (CharField): The SHA-1 id issued before UUIDs, still accepted in lookups.
         name (CharField): The name of the category.
         user (ForeignKey): The user who owns this category.
     """
-    id = models.CharField(
+    id = models.UUIDField(
         primary_key=True,
+        default=uuid7,
+        editable=False,
+    )
+    legacy_id = models.CharField(
         max_length=40,
+        unique=True,
+        null=True,
+        blank=True,
         editable=False,
     )
     name = models.CharField(max_length=100)
@@ -29,6 +38,10 @@ class Category(BaseModel):
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
         unique_together = ('user', 'name')
+        indexes = [
+            # Индекс под keyset-пагинацию списка категорий пользователя
+            models.Index(fields=['user', '-created_at', 'id'], name='category_user_created_idx'),
+        ]
 
     def __str__(self):
         """String representation of a Category."""
@@ -40,7 +53,8 @@ class Task(BaseModel):
     Represents a single task in the ToDo list.
 
     Attributes:
-        id (CharField): The primary key, a 64-character hash.
+        id (UUIDField): The primary key, a time-ordered UUIDv7.
+        legacy_id (CharField): The SHA-1 id issued before UUIDs, still accepted in lookups.
         title (CharField): The title of the task.
         description (TextField): A detailed description of the task.
         due_date (DateTimeField): The date and time when the task should be completed.
@@ -49,9 +63,16 @@ class Task(BaseModel):
         user (ForeignKey): The user who owns this task.
         categories (ManyToManyField): The categories associated with this task.
     """
-    id = models.CharField(
+    id = models.UUIDField(
         primary_key=True,
+        default=uuid7,
+        editable=False,
+    )
+    legacy_id = models.CharField(
         max_length=40,
+        unique=True,
+        null=True,
+        blank=True,
         editable=False,
     )
     title = models.CharField(max_length=255)
@@ -74,6 +95,24 @@ class Task(BaseModel):
         ordering = ('-created_at',)
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
+        indexes = [
+            # Индекс под keyset-пагинацию списка задач пользователя
+            models.Index(fields=['user', '-created_at', 'id'], name='task_user_created_idx'),
+            # Индексы под фильтры списка задач (todos.filters.TaskFilter)
+            models.Index(fields=['user', 'is_completed', '-created_at', 'id'], name='task_user_status_created_idx'),
+            models.Index(fields=['user', 'due_date', 'id'], name='task_user_due_idx'),
+            models.Index(
+                fields=['user', 'due_date', 'id'],
+                condition=models.Q(is_completed=False),
+                name='task_user_open_due_idx',
+            ),
+            # Частичный индекс для поиска задач, по которым нужно отправить напоминание
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(is_completed=False, notification_sent=False),
+                name='task_due_notification_idx',
+            ),
+        ]
 
     def __str__(self):
         """String representation of a Task."""
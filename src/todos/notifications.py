@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from typing import Optional
+
+import httpx
+from django.conf import settings
+
+
+class NotificationDeliveryError(Exception):
+    """
+    Raised when the bot's webhook did not accept a notification.
+
+    Attributes:
+        retryable (bool): Whether delivering the same payload again may succeed.
+    """
+
+    def __init__(self, message: str, *, retryable: bool):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+# Пул соединений и event loop живут всё время жизни процесса воркера.
+# threading.local защищает от запуска воркера с пулом `threads`.
+_state = threading.local()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Returns the event loop owned by the current worker thread."""
+    loop = getattr(_state, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _state.loop = loop
+    return loop
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Returns the keep-alive HTTP client owned by the current worker thread."""
+    client = getattr(_state, 'client', None)
+    if client is None or client.is_closed:
+        max_in_flight = settings.NOTIFICATION_MAX_IN_FLIGHT
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.NOTIFICATION_HTTP_TIMEOUT,
+                connect=settings.NOTIFICATION_HTTP_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight,
+            ),
+        )
+        _state.client = client
+    return client
+
+
+def close_client() -> None:
+    """Closes the connection pool and the event loop of the current worker thread."""
+    loop = getattr(_state, 'loop', None)
+    client = getattr(_state, 'client', None)
+    if loop is None or loop.is_closed():
+        return
+
+    if client is not None and not client.is_closed:
+        loop.run_until_complete(client.aclose())
+    loop.close()
+    _state.client = None
+    _state.loop = None
+
+
+async def _post_batch(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    payloads: list[dict]
+) -> list[Optional[NotificationDeliveryError]]:
+    """
+    Posts one batch to the bot's batch endpoint.
+
+    Returns the per-item delivery errors instead of raising them.
+    """
+    async with semaphore:
+        try:
+            response = await client.post(settings.BOT_WEBHOOK_BATCH_URL, json={"notifications": payloads})
+        except httpx.HTTPError as e:
+            error = NotificationDeliveryError(f"{type(e).__name__}: {e}", retryable=True)
+            return [error] * len(payloads)
+
+    if not response.is_success:
+        # 4xx (кроме 429) означает, что бот отверг сам payload - повтор не поможет
+        retryable = response.status_code == 429 or response.is_server_error
+        error = NotificationDeliveryError(f"Webhook responded with {response.status_code}", retryable=retryable)
+        return [error] * len(payloads)
+
+    # За прокси успешный ответ может прийти с HTML или пустым телом
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    results = body.get("results") if isinstance(body, dict) else None
+    if not isinstance(results, list) or len(results) != len(payloads):
+        error = NotificationDeliveryError("Webhook returned a malformed batch response", retryable=True)
+        return [error] * len(payloads)
+
+    # queued - бот еще отправляет сообщение в фоне, retry - временная ошибка Telegram или сети
+    errors = []
+    for item in results:
+        status = item.get("status") if isinstance(item, dict) else None
+        if status in ("sent", "queued"):
+            errors.append(None)
+        elif status is None:
+            errors.append(NotificationDeliveryError("Webhook returned a malformed batch item", retryable=True))
+        else:
+            errors.append(NotificationDeliveryError(
+                f"Bot could not send notification: {status}", retryable=status == "retry"
+            ))
+    return errors
+
+
+async def _deliver_all(payloads: list[dict]) -> list[Optional[NotificationDeliveryError]]:
+    client = _get_client()
+    semaphore = asyncio.Semaphore(settings.NOTIFICATION_MAX_IN_FLIGHT)
+    batch_size = settings.NOTIFICATION_WEBHOOK_BATCH_SIZE
+    batches = [payloads[i:i + batch_size] for i in range(0, len(payloads), batch_size)]
+
+    batch_results = await asyncio.gather(*(_post_batch(client, semaphore, batch) for batch in batches))
+    return [error for batch_result in batch_results for error in batch_result]
+
+
+def deliver_notifications(payloads: list[dict]) -> list[Optional[NotificationDeliveryError]]:
+    """
+    Delivers notifications to the bot's batch webhook.
+
+    Payloads are sent in batches of `NOTIFICATION_WEBHOOK_BATCH_SIZE` that
+    share one keep-alive connection pool per worker process; at most
+    `NOTIFICATION_MAX_IN_FLIGHT` batches are in flight at once. The bot
+    waits briefly for the sends and reports each item as sent, failed,
+    to retry or still queued in the background.
+
+    Args:
+        payloads (list[dict]): The webhook payloads to deliver.
+
+    Returns:
+        list: For each payload, None on success or the `NotificationDeliveryError`.
+    """
+    if not payloads:
+        return []
+    return _get_loop().run_until_complete(_deliver_all(payloads))
@@ -1,9 +1,143 @@
+import uuid
+from typing import Iterable, Optional, TypeVar
+
 from django.contrib.auth.models import User
-from django.db.models import QuerySet
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import JSONField, Model, OuterRef, Prefetch, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce, JSONObject
 from django.utils import timezone
+from django_filters.utils import translate_validation
 
+from todos.filters import TaskFilter
 from todos.models import Category, Task
 
+ModelT = TypeVar('ModelT', bound=Model)
+
+# Поля, которые можно запросить через sparse fieldsets (см. аргументы fields/category_fields)
+TASK_FIELDS = ('id', 'title', 'description', 'due_date', 'is_completed', 'created_at', 'updated_at', 'categories')
+CATEGORY_FIELDS = ('id', 'name', 'created_at', 'updated_at')
+
+
+def _id_lookup(ids: Iterable[str]) -> Q:
+    """
+    Matches rows by their UUID primary key or, for ids issued before UUIDs,
+    by `legacy_id`.
+    """
+    uuids, legacy_ids = [], []
+    for value in ids:
+        try:
+            uuids.append(uuid.UUID(str(value)))
+        except ValueError:
+            legacy_ids.append(value)
+
+    return Q(id__in=uuids) | Q(legacy_id__in=legacy_ids)
+
+
+def index_by_ids(objects: Iterable[ModelT]) -> dict[str, ModelT]:
+    """
+    Indexes objects by every id they can be requested with: the UUID in its
+    canonical string form and the legacy id, if any.
+    """
+    index = {}
+    for obj in objects:
+        index[str(obj.id)] = obj
+        if obj.legacy_id:
+            index[obj.legacy_id] = obj
+    return index
+
+
+def task_list_by_ids(*, task_ids: Iterable[str]) -> QuerySet[Task]:
+    """
+    Returns tasks by their IDs, accepting legacy string ids as well.
+
+    Args:
+        task_ids (Iterable[str]): UUIDs or legacy ids of the tasks.
+
+    Returns:
+        QuerySet[Task]: A queryset of the found tasks.
+    """
+    return Task.objects.filter(_id_lookup(task_ids))
+
+
+def category_list_by_ids(*, user: User, category_ids: Iterable[str]) -> QuerySet[Category]:
+    """
+    Returns a user's categories by their IDs, accepting legacy string ids as well.
+
+    Args:
+        user (User): The owner of the categories.
+        category_ids (Iterable[str]): UUIDs or legacy ids of the categories.
+
+    Returns:
+        QuerySet[Category]: A queryset of the found categories.
+    """
+    return Category.objects.filter(_id_lookup(category_ids), user=user)
+
+
+def _task_fields_queryset(
+    queryset: QuerySet[Task],
+    *,
+    fields: Iterable[str],
+    category_fields: Optional[Iterable[str]],
+) -> QuerySet[Task]:
+    """
+    Loads only the requested task columns; categories are prefetched only
+    when requested, with only the requested columns.
+    """
+    queryset = queryset.only(*(field for field in fields if field != 'categories'))
+    if 'categories' in fields:
+        categories = Category.objects.all()
+        if category_fields is not None:
+            categories = categories.only(*category_fields)
+        queryset = queryset.prefetch_related(Prefetch('categories', queryset=categories))
+    return queryset
+
+
+def task_get_for_user(
+    *,
+    user: User,
+    task_id: str,
+    fields: Optional[Iterable[str]] = None,
+    category_fields: Optional[Iterable[str]] = None,
+) -> Optional[Task]:
+    """
+    Returns a single task of a user by its UUID or legacy id.
+
+    Args:
+        user (User): The owner of the task.
+        task_id (str): The UUID or legacy id of the task.
+        fields (Iterable[str], optional): The `TASK_FIELDS` to load; all if omitted.
+        category_fields (Iterable[str], optional): The `CATEGORY_FIELDS` to load
+            if `categories` is requested; all if omitted.
+
+    Returns:
+        Optional[Task]: The task, or None if the user has no such task.
+    """
+    queryset = task_list_by_ids(task_ids=[task_id]).filter(user=user)
+    if fields is not None:
+        queryset = _task_fields_queryset(queryset, fields=fields, category_fields=category_fields)
+    return queryset.first()
+
+
+async def atask_get_for_user(
+    *,
+    user: User,
+    task_id: str,
+    fields: Optional[Iterable[str]] = None,
+    category_fields: Optional[Iterable[str]] = None,
+) -> Optional[Task]:
+    """
+    Async variant of `task_get_for_user`.
+
+    Requested categories are prefetched, so the task can be serialized
+    without further (synchronous) queries.
+    """
+    queryset = task_list_by_ids(task_ids=[task_id]).filter(user=user)
+    if fields is None:
+        queryset = queryset.prefetch_related('categories')
+    else:
+        queryset = _task_fields_queryset(queryset, fields=fields, category_fields=category_fields)
+    return await queryset.afirst()
+
 
 def category_list_for_user(*, user: User) -> QuerySet[Category]:
     """
@@ -18,17 +152,94 @@ def category_list_for_user(*, user: User) -> QuerySet[Category]:
     return Category.objects.filter(user=user)
 
 
-def task_list_for_user(*, user: User) -> QuerySet[Task]:
+def task_list_for_user(*, user: User, filters: Optional[dict] = None) -> QuerySet[Task]:
     """
     Returns a queryset of tasks for a given user.
 
     Args:
         user (User): The user for whom to retrieve tasks.
+        filters (dict, optional): Query parameters understood by `TaskFilter`.
 
     Returns:
         QuerySet[Task]: A queryset of tasks.
+
+    Raises:
+        rest_framework.exceptions.ValidationError: If the filters are invalid.
     """
-    return Task.objects.filter(user=user).prefetch_related('categories')
+    filters = filters or {}
+    qs = Task.objects.filter(user=user).prefetch_related('categories')
+
+    filterset = TaskFilter(filters, queryset=qs)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+
+    return filterset.qs
+
+
+def task_categories_json(category_fields: Iterable[str]) -> Coalesce:
+    """
+    Returns a task's categories as one JSON array, aggregated by a correlated
+    subquery over the through table.
+
+    The expression refers to the outer task's `id`, so it can annotate a task
+    queryset or be compiled into the `RETURNING` clause of a task `UPDATE`.
+    """
+    columns = {'id': 'category_id'}
+    links = (
+        Task.categories.through.objects
+        .filter(task_id=OuterRef('id'))
+        .order_by()
+        .values('task_id')
+        .annotate(data=JSONBAgg(
+            JSONObject(**{field: columns.get(field, f'category__{field}') for field in category_fields}),
+            order_by=('category__created_at', 'category_id'),
+        ))
+        .values('data')
+    )
+    return Coalesce(Subquery(links, output_field=JSONField()), Value([], output_field=JSONField()))
+
+
+def task_values_list_for_user(
+    *,
+    user: User,
+    filters: Optional[dict] = None,
+    fields: Optional[Iterable[str]] = None,
+    category_fields: Optional[Iterable[str]] = None,
+) -> QuerySet[dict]:
+    """
+    Returns a user's tasks as dicts, with their categories in the same query.
+
+    The rows hold the task columns plus, if categories are requested,
+    `category_list`: a list of category dicts whose datetimes are ISO
+    strings. Meant for read paths that format rows directly instead of
+    going through model instances.
+
+    Args:
+        user (User): The user for whom to retrieve tasks.
+        filters (dict, optional): Query parameters understood by `TaskFilter`.
+        fields (Iterable[str], optional): The `TASK_FIELDS` to load; all if omitted.
+        category_fields (Iterable[str], optional): The `CATEGORY_FIELDS` to load
+            if `categories` is requested; all if omitted.
+
+    Returns:
+        QuerySet[dict]: A values queryset of tasks.
+
+    Raises:
+        rest_framework.exceptions.ValidationError: If the filters are invalid.
+    """
+    fields = TASK_FIELDS if fields is None else fields
+    annotations = {}
+    if 'categories' in fields:
+        annotations['category_list'] = task_categories_json(
+            CATEGORY_FIELDS if category_fields is None else category_fields
+        )
+
+    return (
+        task_list_for_user(user=user, filters=filters)
+        .prefetch_related(None)
+        .values(*(field for field in fields if field != 'categories'), **annotations)
+    )
+
 
 def get_due_tasks_for_notification() -> QuerySet[Task]:
     """
@@ -1,32 +1,55 @@
 import datetime
-import hashlib
+import json
+import uuid
 
 from typing import Optional
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.db import connections, transaction
+from django.db.models import QuerySet, prefetch_related_objects
 from django.utils import timezone
-from django.core.exceptions import ValidationError
 
 from common.services import model_update
+from todos.cache import invalidate_user_cache
 from todos.models import Category, Task
+from todos.selectors import (
+    CATEGORY_FIELDS,
+    TASK_FIELDS,
+    category_list_by_ids,
+    get_due_tasks_for_notification,
+    index_by_ids,
+    task_list_by_ids,
+    task_list_for_user,
+)
 
 
-def _generate_hash_id(*, user_id: int, identifier: str) -> str:
+def _task_categories_set(*, task: Task, categories: list[Category], created: bool = False) -> None:
     """
-    Generates a SHA-1 hash to be used as a primary key.
+    Replaces the categories of a task without reading the current links.
 
-    Args:
-        user_id (int): The ID of the user creating the object.
-        identifier (str): A unique string for the object (e.g., title).
+    Links that are no longer wanted are removed with one DELETE and the
+    wanted ones are written with one bulk INSERT that skips existing rows.
 
-    Returns:
-        str: A 40-character hexadecimal string.
+    Args:
+        task (Task): The task to update.
+        categories (list[Category]): The new categories of the task.
+        created (bool): Whether the task was just created, i.e. has no links yet.
     """
-    now_iso = timezone.now().isoformat()
-    creation_string = f"{user_id}:{identifier}:{now_iso}"
-    # Меняем sha256 на sha1
-    return hashlib.sha1(creation_string.encode('utf-8')).hexdigest()
+    task_category = Task.categories.through
+    category_ids = {category.id for category in categories}
+
+    if not created:
+        task_category.objects.filter(task_id=task.id).exclude(category_id__in=category_ids).delete()
+    if category_ids:
+        task_category.objects.bulk_create(
+            [task_category(task_id=task.id, category_id=category_id) for category_id in category_ids],
+            ignore_conflicts=True,
+        )
+
+    # Как и related manager, сбрасываем ранее загруженные категории задачи
+    getattr(task, '_prefetched_objects_cache', {}).pop('categories', None)
 
 
 @transaction.atomic
@@ -45,8 +68,7 @@ def category_create(
     Returns:
         Category: The newly created category instance.
     """
-    category_id = _generate_hash_id(user_id=user.id, identifier=name)
-    category = Category(id=category_id, user=user, name=name)
+    category = Category(user=user, name=name)
     category.full_clean()
     category.save()
 
@@ -75,9 +97,7 @@ def task_create(
     Returns:
         Task: The newly created task instance.
     """
-    task_id = _generate_hash_id(user_id=user.id, identifier=title)
     task = Task(
-        id=task_id,
         user=user,
         title=title,
         description=description,
@@ -87,7 +107,7 @@ def task_create(
     task.save()
 
     if categories:
-        task.categories.set(categories)
+        _task_categories_set(task=task, categories=categories, created=True)
 
     return task
 
@@ -114,26 +134,469 @@ def task_update(*, task: Task, data: dict) -> Task:
     )
 
     if 'categories' in data:
-        task.categories.set(data['categories'])
+        _task_categories_set(task=task, categories=data['categories'])
+        # Связи пишутся в обход сигналов; сохранение самой задачи кэш уже сбросило
+        if not has_updated:
+            invalidate_user_cache(user_id=task.user_id)
 
     return task
 
+
+# Поля задачи без побочных эффектов: их можно менять одним UPDATE, без загрузки задачи
+TASK_SCALAR_FIELDS = ('title', 'description', 'due_date', 'is_completed')
+
+
+def task_update_fields(*, user: User, task_id: str, data: dict, returning: bool = True) -> Optional[dict]:
+    """
+    Updates scalar fields of a user's task with a single `UPDATE ... RETURNING`.
+
+    Unlike `task_update`, the task is not loaded and not validated with
+    `full_clean()`, so `data` must already be validated, e.g. by the task
+    input serializer. Categories are not changed.
+
+    Args:
+        user (User): The owner of the task.
+        task_id (str): The ID of the task; legacy string ids are accepted.
+        data (dict): New values of `TASK_SCALAR_FIELDS`.
+        returning (bool): Whether to return the updated task; otherwise only its `id`.
+
+    Returns:
+        dict: The updated task as a row of `task_values_list_for_user`,
+        i.e. with its categories under `category_list`, or None if the user
+        has no such task.
+    """
+    values = {field: data[field] for field in TASK_SCALAR_FIELDS if field in data}
+    if values.get('description', '') is None:
+        values['description'] = ''
+    # Обновление идет в обход save(), поэтому auto_now проставляем сами
+    values['updated_at'] = timezone.now()
+
+    try:
+        id_column, id_value = 'id', uuid.UUID(str(task_id))
+    except ValueError:
+        id_column, id_value = 'legacy_id', task_id
+
+    # QuerySet.update() не умеет RETURNING, а ответ вместе с категориями нужен без
+    # второго запроса, поэтому SQL пишется явно, с параметрами, по метаданным моделей
+    connection = connections[Task.objects.db]
+    quote_name = connection.ops.quote_name
+
+    def column(model, field):
+        return quote_name(model._meta.get_field(field).column)
+
+    fields = [field for field in TASK_FIELDS if field != 'categories'] if returning else ['id']
+    columns = [f"t.{column(Task, field)}" for field in fields]
+    if returning:
+        # Категории в том же виде, что отдает task_categories_json для списка задач
+        task_column = quote_name(Task.categories.field.m2m_column_name())
+        category_column = quote_name(Task.categories.field.m2m_reverse_name())
+        category_json = ', '.join(
+            f"'{field}', " + (f"l.{category_column}" if field == 'id' else f"c.{column(Category, field)}")
+            for field in CATEGORY_FIELDS
+        )
+        columns.append(
+            f"COALESCE(("
+            f"SELECT jsonb_agg(jsonb_build_object({category_json}) "
+            f"ORDER BY c.{column(Category, 'created_at')}, l.{category_column}) "
+            f"FROM {quote_name(Task.categories.through._meta.db_table)} l "
+            f"JOIN {quote_name(Category._meta.db_table)} c ON c.{column(Category, 'id')} = l.{category_column} "
+            f"WHERE l.{task_column} = t.{column(Task, 'id')}"
+            f"), '[]'::jsonb)"
+        )
+
+    sql = (
+        f"UPDATE {quote_name(Task._meta.db_table)} t "
+        f"SET {', '.join(f'{column(Task, field)} = %s' for field in values)} "
+        f"WHERE t.{column(Task, 'user')} = %s AND t.{column(Task, id_column)} = %s "
+        f"RETURNING {', '.join(columns)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*values.values(), user.id, id_value])
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+
+    # Запрос один, поэтому своя транзакция не нужна; вне транзакции on_commit срабатывает сразу
+    invalidate_user_cache(user_id=user.id)
+    task = dict(zip(fields, row))
+    if returning:
+        task['category_list'] = json.loads(row[-1]) if isinstance(row[-1], str) else row[-1]
+    return task
+
+
 @transaction.atomic
-def task_set_notification_sent(*, task: Task) -> Task:
+def task_delete(*, task: Task) -> None:
     """
-    Marks a task's notification as sent to prevent re-sending.
+    Deletes a task.
 
     Args:
-        task (Task): The task instance to update.
+        task (Task): The task instance to delete.
+    """
+    task.delete()
+
+
+# Асинхронный ORM Django не поддерживает транзакции, поэтому записи, которым нужна
+# атомарность, выполняются синхронным сервисом в потоке через sync_to_async
+
+
+async def acategory_create(*, user: User, name: str) -> Category:
+    """Async variant of `category_create`."""
+    return await sync_to_async(category_create)(user=user, name=name)
+
+
+def _task_with_categories(task: Task) -> Task:
+    """Prefetches categories, so the task can be serialized in async code."""
+    prefetch_related_objects([task], 'categories')
+    return task
+
+
+async def atask_create(
+    *,
+    user: User,
+    title: str,
+    due_date: datetime.datetime,
+    description: Optional[str] = "",
+    categories: Optional[list[Category]] = None,
+) -> Task:
+    """
+    Async variant of `task_create`.
 
     Returns:
-        Task: The updated task instance.
+        Task: The newly created task with its categories prefetched.
+    """
+    return await sync_to_async(lambda: _task_with_categories(task_create(
+        user=user,
+        title=title,
+        due_date=due_date,
+        description=description,
+        categories=categories,
+    )))()
+
+
+async def atask_update(*, task: Task, data: dict) -> Task:
+    """
+    Async variant of `task_update`.
+
+    Returns:
+        Task: The updated task with its categories prefetched.
+    """
+    return await sync_to_async(lambda: _task_with_categories(task_update(task=task, data=data)))()
+
+
+async def atask_update_fields(*, user: User, task_id: str, data: dict, returning: bool = True) -> Optional[dict]:
+    """Async variant of `task_update_fields`."""
+    return await sync_to_async(task_update_fields)(user=user, task_id=task_id, data=data, returning=returning)
+
+
+async def atask_delete(*, task: Task) -> None:
+    """Async variant of `task_delete`."""
+    await task.adelete()
+
+
+def _unknown_category_errors(data: dict, categories_by_id: dict[str, Category]) -> Optional[dict]:
+    """Returns per-item errors for categories that do not belong to the user."""
+    unknown = sorted(set(data.get('categories', [])) - categories_by_id.keys())
+    if unknown:
+        return {'categories': [f"Unknown category: {category_id}" for category_id in unknown]}
+    return None
+
+
+def _task_delete_raw(*, tasks: QuerySet[Task]) -> int:
+    """
+    Deletes tasks and their category links without loading them.
+
+    `QuerySet.delete()` first selects every full row for the deletion
+    collector and then deletes by long `IN` lists of ids. Here both tables
+    are cleared by one statement scoped by the subquery over `tasks`. The
+    through table is the only relation pointing at `Task`. Delete signals
+    are not sent, so callers invalidate the user's cache themselves.
+
+    Args:
+        tasks (QuerySet[Task]): The tasks to delete.
+
+    Returns:
+        int: The number of deleted tasks.
+    """
+    # Оба DELETE в одном запросе видят один снимок данных: подзапрос задач может
+    # соединяться с таблицей связей (фильтр по категории), и удаленные первыми
+    # связи не должны влиять на выбор задач
+    connection = connections[tasks.db]
+    quote_name = connection.ops.quote_name
+    task_ids_sql, params = tasks.order_by().values('id').query.sql_with_params()
+    sql = (
+        f"WITH deleted_tasks AS ("
+        f"DELETE FROM {quote_name(Task._meta.db_table)} WHERE id IN ({task_ids_sql}) RETURNING id"
+        f"), deleted_links AS ("
+        f"DELETE FROM {quote_name(Task.categories.through._meta.db_table)} "
+        f"WHERE {quote_name(Task.categories.field.m2m_column_name())} IN (SELECT id FROM deleted_tasks)"
+        f") SELECT count(*) FROM deleted_tasks"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+@transaction.atomic
+def task_bulk_apply(
+    *,
+    user: User,
+    creates: list[dict],
+    updates: list[dict],
+    deletes: list[str],
+) -> dict[str, list[dict]]:
+    """
+    Creates, updates and deletes many tasks of a user in one transaction.
+
+    Categories of all items are resolved with a single query, tasks are
+    written with `bulk_create` / `bulk_update` and category links with one
+    bulk insert into the through table. Items that cannot be applied are
+    reported and skipped; the rest is applied. Repeated updates of one task
+    are applied in input order, the last given categories win.
+
+    Args:
+        user (User): The owner of the tasks.
+        creates (list[dict]): Validated task data, as for `task_create`,
+            with `categories` given as a list of category IDs.
+        updates (list[dict]): Validated partial task data, each with an `id`.
+        deletes (list[str]): The IDs of the tasks to delete.
+
+    Returns:
+        dict: Per-item results under `create`, `update` and `delete`, in input order.
+    """
+    batch_size = settings.TODOS_BULK_BATCH_SIZE
+    task_category = Task.categories.through
+    results = {'create': [], 'update': [], 'delete': []}
+
+    requested_category_ids = {
+        category_id for data in (*creates, *updates) for category_id in data.get('categories', [])
+    }
+    categories_by_id = {}
+    if requested_category_ids:
+        categories_by_id = index_by_ids(
+            category_list_by_ids(user=user, category_ids=requested_category_ids).only('id', 'legacy_id')
+        )
+
+    def canonical_category_ids(category_ids: list[str]) -> set:
+        # UUID и legacy id одной категории сводятся к одному первичному ключу
+        return {categories_by_id[category_id].id for category_id in category_ids}
+
+    # Итоговые категории каждой задачи: при повторах задачи в запросе побеждает последний
+    task_category_ids = {}
+    new_tasks = []
+    for data in creates:
+        errors = _unknown_category_errors(data, categories_by_id)
+        if errors:
+            results['create'].append({'status': 'invalid', 'errors': errors})
+            continue
+
+        task = Task(
+            user=user,
+            title=data['title'],
+            description=data.get('description') or '',
+            due_date=data['due_date'],
+            is_completed=data.get('is_completed', False),
+        )
+        new_tasks.append(task)
+        task_category_ids[task.id] = canonical_category_ids(data.get('categories', []))
+        results['create'].append({'id': str(task.id), 'status': 'created'})
+
+    Task.objects.bulk_create(new_tasks, batch_size=batch_size)
+
+    tasks_by_id = {}
+    if updates:
+        tasks_by_id = index_by_ids(task_list_by_ids(task_ids=[data['id'] for data in updates]).filter(user=user))
+    now = timezone.now()
+    # Повторы одной задачи (в том числе по UUID и legacy id) применяются к одному объекту по порядку
+    changed_tasks = {}
+    changed_fields = {'updated_at'}
+    relinked_task_ids = set()
+    for data in updates:
+        task = tasks_by_id.get(data['id'])
+        if task is None:
+            results['update'].append({'id': data['id'], 'status': 'not_found'})
+            continue
+
+        errors = _unknown_category_errors(data, categories_by_id)
+        if errors:
+            results['update'].append({'id': data['id'], 'status': 'invalid', 'errors': errors})
+            continue
+
+        for field in ('title', 'description', 'due_date', 'is_completed'):
+            if field in data:
+                value = data[field]
+                setattr(task, field, '' if field == 'description' and value is None else value)
+                changed_fields.add(field)
+        # bulk_update не вызывает pre_save, поэтому auto_now проставляем сами
+        task.updated_at = now
+        changed_tasks[task.id] = task
+
+        if 'categories' in data:
+            relinked_task_ids.add(task.id)
+            task_category_ids[task.id] = canonical_category_ids(data['categories'])
+        results['update'].append({'id': data['id'], 'status': 'updated'})
+
+    if changed_tasks:
+        Task.objects.bulk_update(changed_tasks.values(), fields=sorted(changed_fields), batch_size=batch_size)
+    if relinked_task_ids:
+        task_category.objects.filter(task_id__in=relinked_task_ids).delete()
+    task_category.objects.bulk_create(
+        [
+            task_category(task_id=task_id, category_id=category_id)
+            for task_id, category_ids in task_category_ids.items()
+            for category_id in category_ids
+        ],
+        batch_size=batch_size,
+    )
+
+    deleted_by_id = {}
+    if deletes:
+        deleted_by_id = index_by_ids(task_list_by_ids(task_ids=deletes).filter(user=user).only('id', 'legacy_id'))
+        _task_delete_raw(tasks=Task.objects.filter(id__in={task.id for task in deleted_by_id.values()}))
+    results['delete'] = [
+        {'id': task_id, 'status': 'deleted' if task_id in deleted_by_id else 'not_found'}
+        for task_id in deletes
+    ]
+
+    invalidate_user_cache(user_id=user.id)
+    return results
+
+
+def _filtered_task_ids(*, user: User, filters: dict) -> QuerySet:
+    """Returns a subquery of the IDs of the user's tasks matching `TaskFilter` filters."""
+    return task_list_for_user(user=user, filters=filters).values('id')
+
+
+@transaction.atomic
+def task_complete_by_filter(*, user: User, filters: dict) -> int:
+    """
+    Marks all open tasks of a user matching the filters as completed.
+
+    Runs as a single `UPDATE`.
+
+    Args:
+        user (User): The owner of the tasks.
+        filters (dict): Query parameters understood by `TaskFilter`.
+
+    Returns:
+        int: The number of completed tasks.
+    """
+    affected = Task.objects.filter(
+        user=user,
+        is_completed=False,
+        id__in=_filtered_task_ids(user=user, filters=filters),
+    ).update(is_completed=True, updated_at=timezone.now())
+
+    if affected:
+        invalidate_user_cache(user_id=user.id)
+    return affected
+
+
+@transaction.atomic
+def task_delete_by_filter(*, user: User, filters: dict) -> int:
+    """
+    Deletes all tasks of a user matching the filters.
+
+    The tasks and their category links are removed by a single statement
+    scoped by the filter subquery; no rows are loaded.
+
+    Args:
+        user (User): The owner of the tasks.
+        filters (dict): Query parameters understood by `TaskFilter`.
+
+    Returns:
+        int: The number of deleted tasks.
+    """
+    affected = _task_delete_raw(tasks=task_list_for_user(user=user, filters=filters))
+
+    if affected:
+        invalidate_user_cache(user_id=user.id)
+    return affected
+
+
+@transaction.atomic
+def task_move_category_by_filter(
+    *,
+    user: User,
+    filters: dict,
+    from_category: Category,
+    to_category: Category,
+) -> int:
+    """
+    Moves the user's tasks matching the filters from one category to another.
+
+    Category links are rewritten in place with one `UPDATE`; links that
+    would duplicate an existing link to `to_category` are deleted instead.
+
+    Args:
+        user (User): The owner of the tasks.
+        filters (dict): Query parameters understood by `TaskFilter`.
+        from_category (Category): The category to move tasks out of.
+        to_category (Category): The category to move tasks into.
+
+    Returns:
+        int: The number of moved tasks.
     """
-    if task.notification_sent:
-        raise ValidationError("Notification has already been sent for this task.")
+    if from_category.pk == to_category.pk:
+        return 0
+
+    task_category = Task.categories.through
+    links = task_category.objects.filter(
+        category_id=from_category.pk,
+        task_id__in=_filtered_task_ids(user=user, filters=filters),
+    )
+    already_linked, _ = links.filter(
+        task_id__in=task_category.objects.filter(category_id=to_category.pk).values('task_id')
+    ).delete()
+    affected = already_linked + links.update(category_id=to_category.pk)
+
+    if affected:
+        invalidate_user_cache(user_id=user.id)
+    return affected
 
-    task.notification_sent = True
-    task.full_clean(exclude=['user', 'categories'])
-    task.save(update_fields=['notification_sent'])
 
-    return task
\ No newline at end of file
+@transaction.atomic
+def task_claim_due_for_notification(*, batch_size: int) -> list[str]:
+    """
+    Atomically claims a bounded batch of due tasks for notification.
+
+    Due rows are locked with `SELECT ... FOR UPDATE SKIP LOCKED` and flagged
+    as notified in the same transaction, so concurrent scanners never claim
+    the same task twice. When called inside an outer transaction the locks
+    are held until that transaction commits.
+
+    Args:
+        batch_size (int): The maximum number of tasks to claim.
+
+    Returns:
+        list[str]: The IDs of the claimed tasks, oldest due date first.
+    """
+    task_ids = list(
+        get_due_tasks_for_notification()
+        .select_for_update(skip_locked=True)
+        .order_by('due_date')
+        .values_list('id', flat=True)[:batch_size]
+    )
+
+    if task_ids:
+        Task.objects.filter(id__in=task_ids).update(notification_sent=True)
+
+    # Строки, чтобы ID без преобразований уходили в JSON-сообщения Celery
+    return [str(task_id) for task_id in task_ids]
+
+
+def task_release_notification_claim(*, task_ids: list[str]) -> int:
+    """
+    Releases claimed tasks whose notification could not be delivered,
+    so that the next due-task scan claims them again.
+
+    Args:
+        task_ids (list[str]): The IDs of previously claimed tasks.
+
+    Returns:
+        int: The number of released tasks.
+    """
+    return task_list_by_ids(task_ids=task_ids).filter(
+        is_completed=False,
+        notification_sent=True
+    ).update(notification_sent=False)
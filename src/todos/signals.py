@@ -0,0 +1,26 @@
+from typing import Union
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from todos.cache import invalidate_user_cache
+from todos.models import Category, Task
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_user_cache_on_change(sender, instance: Union[Task, Category], **kwargs):
+    """
+    Makes the owner's cached todos stale whenever a task or category is
+    saved or deleted, including from the admin or the shell.
+    """
+    invalidate_user_cache(user_id=instance.user_id)
+
+
+@receiver(m2m_changed, sender=Task.categories.through)
+def invalidate_user_cache_on_categories_change(sender, instance: Union[Task, Category], action: str, **kwargs):
+    """Makes the owner's cached todos stale when task categories are relinked."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_user_cache(user_id=instance.user_id)
@@ -1,63 +1,172 @@
-import httpx
+import time
+
 from celery import shared_task
+from celery.signals import worker_process_shutdown
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 
 from todos.models import Task
+from todos.notifications import close_client, deliver_notifications
+from todos.selectors import index_by_ids, task_list_by_ids
 
 
 logger = get_task_logger(__name__)
 
 
+@worker_process_shutdown.connect
+def _close_notification_client(**kwargs):
+    """Closes the worker's pooled webhook connections on shutdown."""
+    close_client()
+
+
+def _build_notification_payload(task: Task) -> dict:
+    """Builds the bot webhook payload for a due task."""
+    telegram_id = task.user.telegram_profile.telegram_id
+    message_text = f"🔔 Reminder! Your task '{task.title}' is due now."
+    return {"telegram_id": telegram_id, "message": message_text}
+
+
+def _dispatch_notifications(task_ids: list[str]) -> dict:
+    """
+    Delivers notifications for already claimed tasks.
+
+    All tasks are loaded with a single query and delivered concurrently
+    over the worker's pooled connections to the bot's webhook.
+
+    Args:
+        task_ids (list[str]): The IDs of claimed tasks.
+
+    Returns:
+        dict: Per-task outcome lists under `sent`, `failed` (permanent),
+        `retry` (transient) and `missing`, plus delivery time in `elapsed`.
+    """
+    # Сообщения, поставленные в очередь до перехода на UUID, несут legacy ID
+    tasks = task_list_by_ids(task_ids=task_ids).select_related('user__telegram_profile')
+    tasks_by_id = index_by_ids(tasks)
+    result = {"sent": [], "failed": [], "retry": [], "missing": [], "elapsed": 0.0}
+
+    pending_ids, payloads = [], []
+    for task_id in task_ids:
+        task = tasks_by_id.get(task_id)
+        if task is None:
+            logger.warning(f"Task with id {task_id} not found.")
+            result["missing"].append(task_id)
+            continue
+
+        try:
+            payloads.append(_build_notification_payload(task))
+            pending_ids.append(task_id)
+        except ObjectDoesNotExist:
+            logger.error(f"Task {task_id} owner has no Telegram profile.")
+            result["failed"].append(task_id)
+
+    started = time.monotonic()
+    errors = deliver_notifications(payloads)
+    result["elapsed"] = time.monotonic() - started
+
+    for task_id, error in zip(pending_ids, errors):
+        if error is None:
+            result["sent"].append(task_id)
+        elif error.retryable:
+            logger.warning(f"Transient error delivering task {task_id}: {error}")
+            result["retry"].append(task_id)
+        else:
+            logger.error(f"Error delivering task {task_id}: {error}")
+            result["failed"].append(task_id)
+
+    if payloads:
+        rate = len(payloads) / result["elapsed"] if result["elapsed"] else 0.0
+        logger.info(
+            f"Delivered {len(result['sent'])}/{len(payloads)} notifications "
+            f"in {result['elapsed']:.3f}s ({rate:.1f}/s)."
+        )
+
+    return result
+
+
 @shared_task
 def send_due_task_notification(task_id: str):
     """
-    Handles the logic for a single due task:
-    1. Marks it as notified.
-    2. Sends a notification to the user via the bot's webhook.
+    Sends a notification for a single due task.
+
+    Kept for messages enqueued before chunked dispatch; forwards the task
+    to `send_due_task_notifications`.
+    """
+    send_due_task_notifications.delay([task_id])
+
+
+@shared_task(bind=True)
+def send_due_task_notifications(self, task_ids: list[str]) -> dict:
     """
-    from todos.services import task_set_notification_sent
+    Sends notifications for a chunk of due tasks via the bot's webhook.
 
-    try:
-        task = Task.objects.select_related('user__telegram_profile').get(id=task_id)
-        task_set_notification_sent(task=task)
-        logger.info(f"Notification flag set for task {task_id}")
+    The tasks have already been marked as notified with one bulk UPDATE
+    when they were claimed by `check_for_due_tasks`. Transient failures are
+    retried with exponential backoff; once retries are exhausted the claim
+    is released so the next scan picks the tasks up again.
 
-        # Вызываем webhook бота
-        telegram_id = task.user.telegram_profile.telegram_id
-        message_text = f"🔔 Reminder! Your task '{task.title}' is due now."
-        webhook_url = settings.BOT_WEBHOOK_URL
+    Returns:
+        dict: Per-task outcomes, see `_dispatch_notifications`.
+    """
+    from todos.services import task_release_notification_claim
 
-        payload = {"telegram_id": telegram_id, "message": message_text}
+    result = _dispatch_notifications(task_ids)
+    logger.info(
+        f"Notification chunk done: {len(result['sent'])} sent, {len(result['failed'])} failed, "
+        f"{len(result['retry'])} to retry, {len(result['missing'])} missing."
+    )
 
-        with httpx.Client() as client:
-            response = client.post(webhook_url, json=payload)
-            response.raise_for_status()
+    if result["retry"]:
+        retries = self.request.retries
+        if retries < settings.NOTIFICATION_MAX_RETRIES:
+            countdown = min(
+                settings.NOTIFICATION_RETRY_BACKOFF * 2 ** retries,
+                settings.NOTIFICATION_RETRY_BACKOFF_MAX,
+            )
+            raise self.retry(
+                args=[result["retry"]],
+                countdown=countdown,
+                max_retries=settings.NOTIFICATION_MAX_RETRIES,
+            )
 
-        logger.info(f"Successfully triggered webhook for task {task_id}")
+        task_release_notification_claim(task_ids=result["retry"])
+        logger.warning(f"Released {len(result['retry'])} tasks for the next due-task scan.")
 
-    except Task.DoesNotExist:
-        logger.warning(f"Task with id {task_id} not found.")
-    except Exception as e:
-        logger.error(f"Error processing task {task_id}: {e}")
+    return result
 
 
 @shared_task
 def check_for_due_tasks():
     """
-    Periodically checks for due tasks and triggers individual notification tasks.
+    Periodically claims due tasks in bounded batches and triggers
+    chunked notification tasks, `NOTIFICATION_DISPATCH_CHUNK_SIZE` tasks each.
+
+    Claiming uses `SELECT ... FOR UPDATE SKIP LOCKED`, so overlapping runs
+    never dispatch the same task twice. Messages are enqueued inside the
+    claiming transaction: if the broker is unavailable the claim is rolled
+    back and the tasks are picked up by the next run.
     """
-    from todos.selectors import get_due_tasks_for_notification
+    from todos.services import task_claim_due_for_notification
 
     logger.info("Checking for due tasks...")
-    due_tasks = get_due_tasks_for_notification()
+    batch_size = settings.NOTIFICATION_CLAIM_BATCH_SIZE
+    chunk_size = settings.NOTIFICATION_DISPATCH_CHUNK_SIZE
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            task_ids = task_claim_due_for_notification(batch_size=batch_size)
+            for i in range(0, len(task_ids), chunk_size):
+                send_due_task_notifications.delay(task_ids[i:i + chunk_size])
 
-    if not due_tasks:
+        total += len(task_ids)
+        if len(task_ids) < batch_size:
+            break
+
+    if not total:
         logger.info("No due tasks found.")
         return
 
-    for task in due_tasks:
-        logger.info(f"Found due task: {task.id}. Triggering notification.")
-        send_due_task_notification.delay(task.id)
-
-    logger.info(f"Triggered notifications for {due_tasks.count()} tasks.")
\ No newline at end of file
+    logger.info(f"Triggered notifications for {total} tasks.")
@@ -1,3 +1,706 @@
-from django.test import TestCase
+import gzip
+import importlib
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import msgpack
+import orjson
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+import core.urls
+import todos.urls
+import users.urls
+from todos.apis import CategoryAsyncApi, TaskAsyncApi, TaskDetailAsyncApi
+from todos.models import Category, Task
+from todos.notifications import NotificationDeliveryError, deliver_notifications
+from todos.services import task_claim_due_for_notification, task_release_notification_claim
+from todos.tasks import check_for_due_tasks, send_due_task_notifications
+from users.apis import TelegramAuthAsyncApi
+from users.models import TelegramProfile
+
+
+class TodosApiTestCase(TestCase):
+    """
+    Base class for API tests: a task owner with `categories_count` categories,
+    a second user and a client authenticated as the owner.
+    """
+    categories_count = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner')
+        cls.other_user = User.objects.create_user(username='other')
+        cls.categories = Category.objects.bulk_create(
+            [Category(user=cls.user, name=f"category {i}") for i in range(cls.categories_count)]
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class TaskPaginationTests(TodosApiTestCase):
+    """Keyset pagination of the task list."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        due_date = timezone.now() + timezone.timedelta(days=1)
+        Task.objects.bulk_create([
+            Task(user=cls.user, title=f"task {i}", due_date=due_date + timezone.timedelta(hours=i // 3))
+            for i in range(7)
+        ])
+        # Одинаковые created_at и due_date внутри групп: порядок страниц держится только на id
+        Task.objects.update(created_at=due_date)
+
+    def _pages(self, ordering=None, limit=2) -> list[list[str]]:
+        url = reverse('todos:tasks:list-create')
+        params = {'limit': limit, **({'ordering': ordering} if ordering else {})}
+        pages = []
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['results']])
+            if response.data['next'] is None:
+                return pages
+            params['cursor'] = response.data['next']
+
+    def test_pages_cover_every_task_once_in_order(self):
+        for ordering, order_by in (
+            (None, ('-created_at', 'id')),
+            ('due_date', ('due_date', 'id')),
+            ('-due_date', ('-due_date', 'id')),
+        ):
+            with self.subTest(ordering=ordering):
+                pages = self._pages(ordering)
+
+                expected = [str(task_id) for task_id in Task.objects.order_by(*order_by).values_list('id', flat=True)]
+                self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+                self.assertEqual(sum(pages, []), expected)
+
+    def test_last_full_page_has_no_next_cursor(self):
+        pages = self._pages(limit=7)
+
+        self.assertEqual([len(page) for page in pages], [7])
+
+    def test_invalid_cursor_is_rejected(self):
+        url = reverse('todos:tasks:list-create')
+
+        for cursor in ('not-a-cursor', 'W10=', 'WyJhIl0='):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {'cursor': cursor})
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.data)
+
+    def test_cursor_of_another_ordering_is_rejected(self):
+        url = reverse('todos:tasks:list-create')
+        cursor = self.client.get(url, {'limit': 2, 'ordering': 'due_date'}).data['next']
+
+        response = self.client.get(url, {'cursor': cursor, 'ordering': '-due_date'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.data)
+
+
+class ContentNegotiationTests(TodosApiTestCase):
+    """MessagePack and gzip encodings of the API."""
+
+    def setUp(self):
+        super().setUp()
+        Task.objects.bulk_create([
+            Task(user=self.user, title=f"task {i}", due_date=timezone.now()) for i in range(3)
+        ])
+        self.url = reverse('todos:tasks:list-create')
+
+    def test_msgpack_is_rendered_when_preferred(self):
+        expected = self.client.get(self.url).json()
+
+        # Как у бота: DRF не учитывает q, поэтому JSON в Accept не перечисляется
+        response = self.client.get(self.url, headers={'Accept': 'application/msgpack'})
+
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), expected)
+
+    def test_msgpack_body_is_parsed(self):
+        category_id = str(self.categories[0].id)
+        body = msgpack.packb({'title': 'packed', 'due_date': '2030-01-01 10:00', 'categories': [category_id]})
+
+        response = self.client.post(
+            self.url, body, content_type='application/msgpack', headers={'Accept': 'application/msgpack'}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = msgpack.unpackb(response.content)
+        self.assertEqual((data['title'], [category['id'] for category in data['categories']]), ('packed', [category_id]))
+
+    def test_malformed_msgpack_body_is_rejected(self):
+        response = self.client.post(self.url, b'\xc1', content_type='application/msgpack')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_response_is_gzipped_on_request(self):
+        expected = self.client.get(self.url).json()
+
+        response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(orjson.loads(gzip.decompress(response.content)), expected)
+
+
+class SparseFieldsetTests(TodosApiTestCase):
+    """Sparse fieldsets of task reads, requested with `fields`."""
+
+    def setUp(self):
+        super().setUp()
+        # Ответы кэшируются по версии пользователя, а on_commit в TestCase не срабатывает
+        cache.clear()
+        self.task = Task.objects.create(user=self.user, title='task', description='text', due_date=timezone.now())
+        self.task.categories.set(self.categories[:2])
+        self.list_url = reverse('todos:tasks:list-create')
+        self.detail_url = reverse('todos:tasks:detail-update-destroy', kwargs={'task_id': self.task.id})
+
+    def _get(self, url, fields, queries=1):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, {'fields': fields})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'][0] if url == self.list_url else response.data
+
+    def test_only_requested_task_fields_are_returned(self):
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                task = self._get(url, 'id,title')
+
+                self.assertEqual(task, {'id': str(self.task.id), 'title': 'task'})
+
+    def test_category_fields_are_selected_with_a_prefix(self):
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                cache.clear()
+                # Список собирает категории подзапросом, деталь - prefetch только нужных колонок
+                task = self._get(url, 'title,categories.name', queries=1 if url == self.list_url else 2)
+
+                self.assertEqual(list(task), ['title', 'categories'])
+                self.assertEqual(task['categories'], [{'name': 'category 0'}, {'name': 'category 1'}])
+
+    def test_bare_categories_returns_every_category_field(self):
+        task = self._get(self.detail_url, 'id,categories', queries=2)
+
+        self.assertEqual(list(task['categories'][0]), ['id', 'name', 'created_at', 'updated_at'])
+
+    def test_unknown_fields_are_rejected(self):
+        for fields in ('id,secret', 'categories.secret', 'title.name'):
+            for url in (self.list_url, self.detail_url):
+                with self.subTest(fields=fields, url=url):
+                    response = self.client.get(url, {'fields': fields})
+
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('fields', response.data)
+
+
+class TaskCategoriesTests(TodosApiTestCase):
+    """Category resolution and M2M updates of the task endpoints."""
+    categories_count = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.foreign_category = Category.objects.create(user=cls.other_user, name='foreign')
+        cls.due_date = (timezone.now() + timezone.timedelta(days=1)).strftime('%Y-%m-%d %H:%M')
+
+    def _category_ids(self, categories) -> list[str]:
+        return [str(category.id) for category in categories]
+
+    def _task_category_ids(self, task_id) -> set[str]:
+        return set(self._category_ids(Task.objects.get(id=task_id).categories.all()))
+
+    def test_create_with_20_categories_resolves_them_in_one_query(self):
+        category_ids = self._category_ids(self.categories[:20])
+
+        # IN-запрос категорий, две проверки full_clean (пользователь и уникальность id),
+        # INSERT задачи, один bulk INSERT связей, выборка категорий для ответа
+        # и savepoint транзакции сервиса (SAVEPOINT + RELEASE)
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                reverse('todos:tasks:list-create'),
+                {'title': 'task', 'due_date': self.due_date, 'categories': category_ids},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self._task_category_ids(response.data['id']), set(category_ids))
+
+    def test_patch_with_20_categories_applies_the_diff_in_two_statements(self):
+        task = Task.objects.create(user=self.user, title='task', due_date=timezone.now())
+        task.categories.set(self.categories[:20])
+        category_ids = self._category_ids(self.categories[10:30])
+
+        # Задача, IN-запрос категорий, один DELETE и один bulk INSERT связей,
+        # выборка категорий для ответа и savepoint транзакции сервиса (SAVEPOINT + RELEASE)
+        with self.assertNumQueries(7):
+            response = self.client.patch(
+                reverse('todos:tasks:detail-update-destroy', kwargs={'task_id': task.id}),
+                {'categories': category_ids},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._task_category_ids(task.id), set(category_ids))
+        self.assertEqual({category['id'] for category in response.data['categories']}, set(category_ids))
+
+    def test_patch_with_unchanged_categories_keeps_links(self):
+        task = Task.objects.create(user=self.user, title='task', due_date=timezone.now())
+        task.categories.set(self.categories[:3])
+        category_ids = self._category_ids(self.categories[:3])
+
+        response = self.client.patch(
+            reverse('todos:tasks:detail-update-destroy', kwargs={'task_id': task.id}),
+            {'categories': category_ids + category_ids[:1]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._task_category_ids(task.id), set(category_ids))
+
+    def test_categories_of_other_users_are_rejected(self):
+        response = self.client.post(
+            reverse('todos:tasks:list-create'),
+            {
+                'title': 'task',
+                'due_date': self.due_date,
+                'categories': [str(self.categories[0].id), str(self.foreign_category.id), 'missing'],
+            },
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            sorted(response.data['categories']),
+            sorted([f"Unknown category: {self.foreign_category.id}", "Unknown category: missing"]),
+        )
+        self.assertFalse(Task.objects.exists())
+
+
+class TaskPatchFastPathTests(TodosApiTestCase):
+    """Scalar-only PATCH applied with a single UPDATE."""
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(user=self.user, title='task', due_date=timezone.now())
+        self.task.categories.set(self.categories)
+
+    def _patch(self, task_id, data, **headers):
+        return self.client.patch(
+            reverse('todos:tasks:detail-update-destroy', kwargs={'task_id': task_id}),
+            data,
+            format='json',
+            headers=headers,
+        )
+
+    def test_scalar_patch_runs_one_query_and_returns_the_task(self):
+        with self.assertNumQueries(1):
+            response = self._patch(self.task.id, {'is_completed': True, 'title': 'renamed'})
+
+        self.assertEqual(response.status_code, 200)
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.is_completed)
+        self.assertEqual(self.task.title, 'renamed')
+        self.assertGreater(self.task.updated_at, self.task.created_at)
+
+        # Ответ совпадает с обычным представлением задачи
+        detail = self.client.get(reverse('todos:tasks:detail-update-destroy', kwargs={'task_id': self.task.id}))
+        self.assertEqual(response.data, detail.data)
+        self.assertEqual(len(response.data['categories']), 3)
+
+    def test_return_minimal_responds_with_204(self):
+        with self.assertNumQueries(1):
+            response = self._patch(self.task.id, {'is_completed': True}, Prefer='return=minimal')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response['Preference-Applied'], 'return=minimal')
+        self.assertFalse(response.content)
+        self.assertTrue(Task.objects.get(id=self.task.id).is_completed)
+
+    def test_task_is_found_by_legacy_id(self):
+        Task.objects.filter(id=self.task.id).update(legacy_id='a' * 40)
+
+        response = self._patch('a' * 40, {'title': 'renamed'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], str(self.task.id))
+        self.assertEqual(Task.objects.get(id=self.task.id).title, 'renamed')
+
+    def test_task_of_other_user_is_not_found(self):
+        self.client.force_authenticate(self.other_user)
+
+        response = self._patch(self.task.id, {'is_completed': True})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Task.objects.get(id=self.task.id).is_completed)
+
+    def test_non_object_body_is_rejected(self):
+        response = self._patch(self.task.id, [{}])
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_data_is_rejected_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self._patch(self.task.id, {'title': 'x' * 256})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.data)
+
+
+class TaskBulkApiTests(TodosApiTestCase):
+    """Repeated items of the bulk endpoint."""
+
+    def test_repeated_task_updates_are_merged(self):
+        task = Task.objects.create(user=self.user, title='task', due_date=timezone.now(), legacy_id='a' * 40)
+        first, second, third = [str(category.id) for category in self.categories]
+        Category.objects.filter(id=third).update(legacy_id='c' * 40)
+
+        response = self.client.post(
+            reverse('todos:tasks:bulk'),
+            {'update': [
+                {'id': str(task.id), 'title': 'first', 'categories': [first, second, first]},
+                {'id': task.legacy_id, 'is_completed': True, 'categories': [second, third, 'c' * 40]},
+            ]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.data['update']], ['updated', 'updated'])
+        task.refresh_from_db()
+        self.assertEqual((task.title, task.is_completed), ('first', True))
+        self.assertEqual({str(category.id) for category in task.categories.all()}, {second, third})
+
+
+    def test_deletes_run_one_lookup_and_one_delete(self):
+        tasks = Task.objects.bulk_create(
+            [Task(user=self.user, title=f"task {i}", due_date=timezone.now()) for i in range(10)]
+        )
+        for task in tasks:
+            task.categories.set(self.categories)
+        foreign = Task.objects.create(user=self.other_user, title='foreign', due_date=timezone.now())
+
+        # Выборка id удаляемых задач, один DELETE задач и связей и savepoint транзакции сервиса
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                reverse('todos:tasks:bulk'),
+                {'delete': [str(task.id) for task in tasks[:5]] + [str(foreign.id)]},
+                format='json',
+            )
+
+        self.assertEqual(
+            [result['status'] for result in response.data['delete']], ['deleted'] * 5 + ['not_found']
+        )
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(Task.categories.through.objects.count(), 5 * len(self.categories))
+
+
+class TaskActionApiTests(TodosApiTestCase):
+    """Filter-scoped task actions."""
+
+    def test_complete_without_filters_is_rejected(self):
+        task = Task.objects.create(user=self.user, title='task', due_date=timezone.now())
+
+        response = self.client.post(reverse('todos:tasks:action-complete'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.get(id=task.id).is_completed)
+
+    def test_complete_with_filters_completes_matching_tasks(self):
+        overdue = Task.objects.create(user=self.user, title='overdue', due_date=timezone.now() - timezone.timedelta(days=1))
+        upcoming = Task.objects.create(user=self.user, title='upcoming', due_date=timezone.now() + timezone.timedelta(days=1))
+
+        response = self.client.post(f"{reverse('todos:tasks:action-complete')}?overdue=true")
+
+        self.assertEqual(response.data, {'affected': 1})
+        self.assertTrue(Task.objects.get(id=overdue.id).is_completed)
+        self.assertFalse(Task.objects.get(id=upcoming.id).is_completed)
+
+
+class TaskListCacheTests(TodosApiTestCase):
+    """Caching of the task list."""
+
+    def test_overdue_filter_is_not_cached(self):
+        task = Task.objects.create(user=self.user, title='task', due_date=timezone.now() + timezone.timedelta(hours=1))
+        url = f"{reverse('todos:tasks:list-create')}?overdue=true"
+
+        first = self.client.get(url)
+        # Срок задачи проходит без записи через API, версия кэша не меняется
+        Task.objects.filter(id=task.id).update(due_date=timezone.now() - timezone.timedelta(hours=1))
+        second = self.client.get(url)
+
+        self.assertNotIn('ETag', first)
+        self.assertEqual(first.data['results'], [])
+        self.assertEqual([row['id'] for row in second.data['results']], [str(task.id)])
+
+    def test_other_filters_are_answered_with_etags(self):
+        url = f"{reverse('todos:tasks:list-create')}?is_completed=false"
+
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+    def test_orm_writes_outside_services_change_etag(self):
+        task = Task.objects.create(user=self.user, title='task', due_date=timezone.now())
+        url = reverse('todos:tasks:list-create')
+        writes = [
+            lambda: Task.objects.filter(id=task.id).first().save(),
+            lambda: task.categories.add(self.categories[0]),
+            lambda: self.categories[1].delete(),
+            lambda: task.delete(),
+        ]
+
+        for write in writes:
+            etag = self.client.get(url)['ETag']
+            # Как в админке и shell: запись через ORM, минуя сервисы
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+
+            self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+
+def _reload_urlconfs():
+    """Re-imports the URLconfs, which pick sync or async views by `API_ASYNC_VIEWS` at import time."""
+    for module in (todos.urls, users.urls, core.urls):
+        importlib.reload(module)
+    clear_url_caches()
+
+
+class AsyncApiTests(TodosApiTestCase):
+    """Smoke tests of the async views, routed with `API_ASYNC_VIEWS` on."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Очистка выполняется в обратном порядке: URLconf перечитывается уже с исходными настройками
+        cls.addClassCleanup(_reload_urlconfs)
+        cls.enterClassContext(override_settings(API_ASYNC_VIEWS=True))
+        _reload_urlconfs()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        super().setUp()
+        self.headers = {'Authorization': f"Token {self.token.key}"}
+        self.task = Task.objects.create(user=self.user, title='task', due_date=timezone.now())
+        self.task.categories.set(self.categories[:1])
+        self.detail_url = reverse('todos:tasks:detail-update-destroy', kwargs={'task_id': self.task.id})
+
+    def test_async_views_are_routed(self):
+        routes = {
+            reverse('users:auth:telegram-auth'): TelegramAuthAsyncApi,
+            reverse('todos:categories:list-create'): CategoryAsyncApi,
+            reverse('todos:tasks:list-create'): TaskAsyncApi,
+            self.detail_url: TaskDetailAsyncApi,
+        }
+        for url, view_class in routes.items():
+            self.assertIs(resolve(url).func.view_class, view_class)
+
+    async def test_telegram_auth(self):
+        response = await self.async_client.post(
+            reverse('users:auth:telegram-auth'), {'telegram_id': 42, 'username': 'async'}, content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['token'])
+
+    async def test_categories(self):
+        url = reverse('todos:categories:list-create')
+
+        created = await self.async_client.post(url, {'name': 'new'}, content_type='application/json', headers=self.headers)
+        listed = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(listed.status_code, 200)
+        self.assertIn('new', [category['name'] for category in listed.json()['results']])
+
+    async def test_tasks(self):
+        url = reverse('todos:tasks:list-create')
+        data = {'title': 'new', 'due_date': '2030-01-01 10:00', 'categories': [str(self.categories[1].id)]}
+
+        created = await self.async_client.post(url, data, content_type='application/json', headers=self.headers)
+        listed = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual([category['name'] for category in created.json()['categories']], ['category 1'])
+        self.assertEqual(listed.status_code, 200)
+        self.assertIn(created.json()['id'], [task['id'] for task in listed.json()['results']])
+
+    async def test_task_detail(self):
+        put_data = {'title': 'put', 'due_date': '2030-01-01 10:00', 'categories': []}
+
+        fetched = await self.async_client.get(self.detail_url, headers=self.headers)
+        patched = await self.async_client.patch(
+            self.detail_url, {'is_completed': True}, content_type='application/json', headers=self.headers
+        )
+        relinked = await self.async_client.patch(
+            self.detail_url, {'categories': [str(self.categories[2].id)]}, content_type='application/json',
+            headers=self.headers,
+        )
+        replaced = await self.async_client.put(self.detail_url, put_data, content_type='application/json', headers=self.headers)
+        deleted = await self.async_client.delete(self.detail_url, headers=self.headers)
+
+        self.assertEqual(fetched.json()['title'], 'task')
+        self.assertIs(patched.json()['is_completed'], True)
+        self.assertEqual([category['name'] for category in relinked.json()['categories']], ['category 2'])
+        self.assertEqual((replaced.json()['title'], replaced.json()['categories']), ('put', []))
+        self.assertEqual(deleted.status_code, 204)
+        # Кэш сбрасывается сигналом удаления после коммита, которого в TestCase нет, поэтому проверяем таблицу
+        self.assertFalse(await Task.objects.filter(id=self.task.id).aexists())
+
+
+class TaskDeleteActionApiTests(TodosApiTestCase):
+    """Filter-scoped deletion of tasks."""
+
+    def test_delete_by_filter_runs_one_statement_per_table(self):
+        done = Task.objects.bulk_create(
+            [Task(user=self.user, title=f"done {i}", due_date=timezone.now(), is_completed=True) for i in range(20)]
+        )
+        for task in done:
+            task.categories.set(self.categories)
+        kept = Task.objects.create(user=self.user, title='open', due_date=timezone.now())
+        kept.categories.set(self.categories)
+        foreign = Task.objects.create(user=self.other_user, title='foreign', due_date=timezone.now(), is_completed=True)
+
+        # Один DELETE задач и связей и savepoint транзакции сервиса (SAVEPOINT + RELEASE)
+        with self.assertNumQueries(3):
+            response = self.client.post(f"{reverse('todos:tasks:action-delete')}?is_completed=true")
+
+        self.assertEqual(response.data, {'affected': 20})
+        self.assertEqual(
+            set(Task.objects.values_list('id', flat=True)), {kept.id, foreign.id}
+        )
+        self.assertEqual(Task.categories.through.objects.count(), len(self.categories))
+
+    def test_delete_by_category_removes_tasks_and_links(self):
+        linked = Task.objects.create(user=self.user, title='linked', due_date=timezone.now())
+        linked.categories.set(self.categories[:2])
+        other = Task.objects.create(user=self.user, title='other', due_date=timezone.now())
+        other.categories.set(self.categories[1:])
+
+        response = self.client.post(f"{reverse('todos:tasks:action-delete')}?category={self.categories[0].id}")
+
+        self.assertEqual(response.data, {'affected': 1})
+        self.assertEqual(list(Task.objects.values_list('id', flat=True)), [other.id])
+        self.assertEqual(Task.categories.through.objects.filter(task_id=linked.id).count(), 0)
+
+
+class DeliverNotificationsTests(TestCase):
+    """Interpretation of the bot's batch webhook responses."""
+
+    def _deliver(self, handler, payloads):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with mock.patch('todos.notifications._get_client', return_value=client):
+            return deliver_notifications(payloads)
+
+    def test_per_item_statuses(self):
+        statuses = ['sent', 'queued', 'retry', 'failed']
+        errors = self._deliver(
+            lambda request: httpx.Response(200, json={'results': [{'status': status} for status in statuses]}),
+            [{'telegram_id': i, 'message': 'm'} for i in range(len(statuses))],
+        )
+
+        self.assertEqual([error and error.retryable for error in errors], [None, None, True, False])
+
+    def test_malformed_success_bodies_are_retryable(self):
+        bodies = [
+            httpx.Response(200, text='<html>Bad gateway</html>'),
+            httpx.Response(200),
+            httpx.Response(200, json=['sent']),
+            httpx.Response(200, json={'results': ['sent']}),
+        ]
+        for body in bodies:
+            with self.subTest(body=body.content):
+                errors = self._deliver(lambda request: body, [{'telegram_id': 1, 'message': 'm'}])
+
+                self.assertEqual(len(errors), 1)
+                self.assertTrue(errors[0].retryable)
+
+
+class DueTaskNotificationTests(TestCase):
+    """Claiming due tasks and dispatching their notifications."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner')
+        TelegramProfile.objects.create(user=cls.user, telegram_id=42)
+        now = timezone.now()
+        cls.due_tasks = Task.objects.bulk_create([
+            Task(user=cls.user, title=f"due {i}", due_date=now - timezone.timedelta(minutes=10 - i))
+            for i in range(5)
+        ])
+        Task.objects.bulk_create([
+            Task(user=cls.user, title='future', due_date=now + timezone.timedelta(hours=1)),
+            Task(user=cls.user, title='completed', due_date=now, is_completed=True),
+            Task(user=cls.user, title='notified', due_date=now, notification_sent=True),
+        ])
+
+    def _due_ids(self) -> list[str]:
+        return [str(task.id) for task in self.due_tasks]
+
+    def _notified_ids(self) -> set[str]:
+        return {str(task_id) for task_id in Task.objects.filter(notification_sent=True).values_list('id', flat=True)}
+
+    def test_claim_is_bounded_oldest_first_and_never_repeats(self):
+        first = task_claim_due_for_notification(batch_size=3)
+        second = task_claim_due_for_notification(batch_size=3)
+        third = task_claim_due_for_notification(batch_size=3)
+
+        self.assertEqual(first, self._due_ids()[:3])
+        self.assertEqual(second, self._due_ids()[3:])
+        self.assertEqual(third, [])
+        self.assertTrue(set(self._due_ids()) <= self._notified_ids())
+
+    def test_release_returns_open_claimed_tasks_to_the_next_scan(self):
+        claimed = task_claim_due_for_notification(batch_size=5)
+        Task.objects.filter(id=claimed[0]).update(is_completed=True)
+
+        released = task_release_notification_claim(task_ids=claimed)
+
+        self.assertEqual(released, 4)
+        self.assertEqual(task_claim_due_for_notification(batch_size=5), claimed[1:])
+
+    @override_settings(NOTIFICATION_CLAIM_BATCH_SIZE=2, NOTIFICATION_DISPATCH_CHUNK_SIZE=1)
+    def test_scan_claims_in_batches_and_enqueues_chunks(self):
+        with mock.patch.object(send_due_task_notifications, 'delay') as delay:
+            check_for_due_tasks()
+
+        self.assertEqual([call.args[0] for call in delay.call_args_list], [[task_id] for task_id in self._due_ids()])
+
+    def test_delivered_and_failed_tasks_stay_claimed(self):
+        task_ids = task_claim_due_for_notification(batch_size=2)
+        errors = [None, NotificationDeliveryError('blocked', retryable=False)]
+
+        with mock.patch('todos.tasks.deliver_notifications', return_value=errors) as deliver:
+            result = send_due_task_notifications.apply(args=[task_ids]).get()
+
+        self.assertEqual(deliver.call_args.args[0][0]['telegram_id'], 42)
+        self.assertEqual((result['sent'], result['failed'], result['retry']), (task_ids[:1], task_ids[1:], []))
+        self.assertEqual(self._notified_ids() & set(task_ids), set(task_ids))
+
+    @override_settings(NOTIFICATION_MAX_RETRIES=2)
+    def test_transient_failures_are_retried_then_released(self):
+        task_ids = task_claim_due_for_notification(batch_size=2)
+        retry_error = NotificationDeliveryError('busy', retryable=True)
+
+        with mock.patch(
+            'todos.tasks.deliver_notifications', side_effect=lambda payloads: [retry_error] * len(payloads)
+        ) as deliver:
+            send_due_task_notifications.apply(args=[task_ids])
+
+        # Первая попытка и два повтора, после чего захват снимается
+        self.assertEqual(deliver.call_count, 3)
+        self.assertFalse(self._notified_ids() & set(task_ids))
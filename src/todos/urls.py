@@ -1,15 +1,37 @@
+from django.conf import settings
 from django.urls import path, include
 
-from todos.apis import CategoryApi, TaskApi, TaskDetailApi
+from todos.apis import (
+    CategoryApi,
+    CategoryAsyncApi,
+    TaskApi,
+    TaskAsyncApi,
+    TaskBulkApi,
+    TaskCompleteActionApi,
+    TaskDeleteActionApi,
+    TaskDetailApi,
+    TaskDetailAsyncApi,
+    TaskMoveCategoryActionApi,
+)
+
+# Под ASGI основные эндпоинты обслуживаются асинхронными вариантами
+category_view = CategoryAsyncApi if settings.API_ASYNC_VIEWS else CategoryApi
+task_view = TaskAsyncApi if settings.API_ASYNC_VIEWS else TaskApi
+task_detail_view = TaskDetailAsyncApi if settings.API_ASYNC_VIEWS else TaskDetailApi
 
 
 category_patterns = [
-    path('', CategoryApi.as_view(), name='list-create'),
+    path('', category_view.as_view(), name='list-create'),
 ]
 
 task_patterns = [
-    path('', TaskApi.as_view(), name='list-create'),
-    path('<str:task_id>/', TaskDetailApi.as_view(), name='detail-update-destroy'),
+    path('', task_view.as_view(), name='list-create'),
+    # Должен идти раньше маршрута деталей, иначе 'bulk' будет принят за task_id
+    path('bulk/', TaskBulkApi.as_view(), name='bulk'),
+    path('actions/complete/', TaskCompleteActionApi.as_view(), name='action-complete'),
+    path('actions/delete/', TaskDeleteActionApi.as_view(), name='action-delete'),
+    path('actions/move-category/', TaskMoveCategoryActionApi.as_view(), name='action-move-category'),
+    path('<str:task_id>/', task_detail_view.as_view(), name='detail-update-destroy'),
 ]
 
 
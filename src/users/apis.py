@@ -1,9 +1,10 @@
+from adrf.views import APIView as AsyncAPIView
 from rest_framework import serializers, status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from users.services import get_or_create_user_by_telegram_id
+from users.services import aget_or_create_user_by_telegram_id, get_or_create_user_by_telegram_id
 
 
 class TelegramAuthApi(APIView):
@@ -25,4 +26,22 @@ class TelegramAuthApi(APIView):
 
         _, token = get_or_create_user_by_telegram_id(**serializer.validated_data)
 
-        return Response({'token': token.key}, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response({'token': token.key}, status=status.HTTP_200_OK)
+
+
+class TelegramAuthAsyncApi(AsyncAPIView):
+    """Async variant of `TelegramAuthApi`, used under ASGI (see `API_ASYNC_VIEWS`)."""
+    permission_classes = (AllowAny,)
+
+    async def post(self, request):
+        """
+        Authenticate a user and return an auth token.
+
+        Creates a new user if one doesn't exist for the given telegram_id.
+        """
+        serializer = TelegramAuthApi.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        _, token = await aget_or_create_user_by_telegram_id(**serializer.validated_data)
+
+        return Response({'token': token.key}, status=status.HTTP_200_OK)
@@ -0,0 +1,71 @@
+import threading
+from typing import Iterable
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+from common.metrics import metric_incr
+
+
+CACHE_KEY_PREFIX = 'auth_token:'
+
+_local_cache = TTLCache(
+    maxsize=settings.AUTH_TOKEN_LOCAL_CACHE_SIZE,
+    ttl=settings.AUTH_TOKEN_LOCAL_CACHE_TTL,
+)
+_local_lock = threading.Lock()
+
+
+def _cache_key(key: str) -> str:
+    return f"{CACHE_KEY_PREFIX}{key}"
+
+
+def invalidate_cached_tokens(*, keys: Iterable[str]) -> None:
+    """
+    Drops tokens from the shared cache and from this process's LRU.
+
+    Other processes keep their LRU entries for at most
+    `AUTH_TOKEN_LOCAL_CACHE_TTL` seconds.
+
+    Args:
+        keys (Iterable[str]): The token keys to invalidate.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+
+    cache.delete_many([_cache_key(key) for key in keys])
+    with _local_lock:
+        for key in keys:
+            _local_cache.pop(key, None)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that avoids the `Token` + `User` query per request.
+
+    Resolved `(user, token)` pairs are kept in an in-process LRU with a short
+    TTL in front of the shared cache (Redis). Invalid and inactive tokens are
+    never cached, so they still fail on every request.
+    """
+
+    def authenticate_credentials(self, key):
+        with _local_lock:
+            credentials = _local_cache.get(key)
+        if credentials is not None:
+            metric_incr('auth_cache.local_hit')
+            return credentials
+
+        credentials = cache.get(_cache_key(key))
+        if credentials is not None:
+            metric_incr('auth_cache.shared_hit')
+        else:
+            metric_incr('auth_cache.miss')
+            credentials = super().authenticate_credentials(key)
+            cache.set(_cache_key(key), credentials, settings.AUTH_TOKEN_CACHE_TTL)
+
+        with _local_lock:
+            _local_cache[key] = credentials
+        return credentials
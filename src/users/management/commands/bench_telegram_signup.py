@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users.services import get_or_create_user_by_telegram_id
+
+
+# Диапазон Telegram ID, заведомо не пересекающийся с реальными пользователями
+BENCH_TELEGRAM_ID_BASE = 9_000_000_000_000
+
+
+class Command(BaseCommand):
+    """
+    Simulates a signup storm against `get_or_create_user_by_telegram_id`.
+
+    Concurrent workers call `/start` logic for new users, and every Telegram
+    ID is submitted several times at once to exercise the race on the
+    unique constraint. Benchmark users are deleted afterwards.
+    """
+    help = "Benchmark concurrent Telegram signups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Number of distinct new users.")
+        parser.add_argument('--duplicates', type=int, default=3, help="Concurrent /start calls per user.")
+        parser.add_argument('--workers', type=int, default=16, help="Concurrent threads.")
+
+    def handle(self, *args, **options):
+        users, duplicates = options['users'], options['duplicates']
+        telegram_ids = [BENCH_TELEGRAM_ID_BASE + i for i in range(users)]
+
+        try:
+            self._report_query_counts(telegram_ids[0])
+
+            calls = [telegram_id for telegram_id in telegram_ids[1:] for _ in range(duplicates)]
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                results = list(executor.map(self._signup, calls))
+            elapsed = time.monotonic() - started
+
+            failures = [result for result in results if isinstance(result, Exception)]
+            created = User.objects.filter(telegram_profile__telegram_id__in=telegram_ids).count()
+            self.stdout.write(
+                f"{len(calls)} signups in {elapsed:.2f}s ({len(calls) / elapsed:.1f}/s), "
+                f"{created} users created, {len(failures)} failures"
+            )
+            for failure in failures[:5]:
+                self.stdout.write(self.style.ERROR(repr(failure)))
+        finally:
+            User.objects.filter(telegram_profile__telegram_id__in=telegram_ids).delete()
+
+    def _signup(self, telegram_id: int):
+        try:
+            user, _ = get_or_create_user_by_telegram_id(telegram_id=telegram_id, username=f"bench{telegram_id}")
+            return user.id
+        except Exception as e:
+            return e
+        finally:
+            connection.close()
+
+    def _report_query_counts(self, telegram_id: int):
+        for label in ("new user", "existing user"):
+            with CaptureQueriesContext(connection) as queries:
+                get_or_create_user_by_telegram_id(telegram_id=telegram_id, username="bench")
+            self.stdout.write(f"{label}: {len(queries)} queries")
@@ -1,11 +1,44 @@
+from typing import Optional
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.db.models import QuerySet
+from django.db import IntegrityError, transaction
 from rest_framework.authtoken.models import Token
 
 from users.models import TelegramProfile
 
 
-@transaction.atomic
+def _telegram_username(*, telegram_id: int, username: str) -> str:
+    """
+    Builds a collision-free username for a new Telegram user.
+
+    The Telegram ID is unique, so appending it makes the username unique
+    without probing the users table.
+
+    Args:
+        telegram_id (int): The user's unique Telegram ID.
+        username (str): The user's Telegram username, may be empty.
+
+    Returns:
+        str: A username that fits `User.username` (150 chars).
+    """
+    if not username or username == str(telegram_id):
+        return f"tg_{telegram_id}"
+
+    suffix = f"_{telegram_id}"
+    return f"tg_{username}"[:150 - len(suffix)] + suffix
+
+
+def _user_with_token_by_telegram_id(*, telegram_id: int) -> QuerySet[User]:
+    return User.objects.select_related('auth_token').filter(telegram_profile__telegram_id=telegram_id)
+
+
+def _get_user_with_token_by_telegram_id(*, telegram_id: int) -> Optional[User]:
+    """Fetches a user and their token (if any) in a single query."""
+    return _user_with_token_by_telegram_id(telegram_id=telegram_id).first()
+
+
 def get_or_create_user_by_telegram_id(
     *,
     telegram_id: int,
@@ -14,6 +47,10 @@ def get_or_create_user_by_telegram_id(
     """
     Retrieves or creates a user based on their Telegram ID.
 
+    An existing user is resolved together with their token in one query.
+    A new user is created with a constant number of INSERTs; if a concurrent
+    request for the same Telegram ID wins the race, its user is returned.
+
     Args:
         telegram_id (int): The user's unique Telegram ID.
         username (str): The user's Telegram username.
@@ -21,20 +58,46 @@ def get_or_create_user_by_telegram_id(
     Returns:
         tuple[User, Token]: A tuple containing the user instance and their auth token.
     """
+    user = _get_user_with_token_by_telegram_id(telegram_id=telegram_id)
+    if user is None:
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=_telegram_username(telegram_id=telegram_id, username=username)
+                )
+                TelegramProfile.objects.create(user=user, telegram_id=telegram_id)
+                token = Token.objects.create(user=user)
+            return user, token
+        except IntegrityError:
+            # Параллельный /start с тем же telegram_id успел создать пользователя
+            user = _get_user_with_token_by_telegram_id(telegram_id=telegram_id)
+            if user is None:
+                raise
+
     try:
-        profile = TelegramProfile.objects.select_related('user').get(telegram_id=telegram_id)
-        user = profile.user
-    except TelegramProfile.DoesNotExist:
-        # Create a user with a unique username
-        base_username = f"tg_{username or telegram_id}"
-        unique_username = base_username
-        counter = 1
-        while User.objects.filter(username=unique_username).exists():
-            unique_username = f"{base_username}_{counter}"
-            counter += 1
-
-        user = User.objects.create_user(username=unique_username)
-        TelegramProfile.objects.create(user=user, telegram_id=telegram_id)
-
-    token, _ = Token.objects.get_or_create(user=user)
-    return user, token
\ No newline at end of file
+        return user, user.auth_token
+    except Token.DoesNotExist:
+        token, _ = Token.objects.get_or_create(user=user)
+        return user, token
+
+
+async def aget_or_create_user_by_telegram_id(
+    *,
+    telegram_id: int,
+    username: str
+) -> tuple[User, Token]:
+    """
+    Async variant of `get_or_create_user_by_telegram_id`.
+
+    A known user with a token is resolved with one async query. Creating a
+    user needs a transaction, which the async ORM does not support, so it
+    runs the sync service in a thread.
+    """
+    user = await _user_with_token_by_telegram_id(telegram_id=telegram_id).afirst()
+    if user is not None:
+        try:
+            return user, user.auth_token
+        except Token.DoesNotExist:
+            pass
+
+    return await sync_to_async(get_or_create_user_by_telegram_id)(telegram_id=telegram_id, username=username)
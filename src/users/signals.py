@@ -0,0 +1,25 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from users.authentication import invalidate_cached_tokens
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_on_change(sender, instance: Token, **kwargs):
+    """Drops a deleted or rotated token from the authentication cache."""
+    invalidate_cached_tokens(keys=[instance.key])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens_on_change(sender, instance: User, created: bool, **kwargs):
+    """
+    Drops the user's tokens from the authentication cache whenever the user
+    changes, e.g. is deactivated, so a stale user is never served.
+    """
+    if created:
+        return
+
+    invalidate_cached_tokens(keys=Token.objects.filter(user=instance).values_list('key', flat=True))
@@ -1,3 +1,128 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from users import authentication, services
+from users.authentication import CachedTokenAuthentication
+from users.models import TelegramProfile
+from users.services import get_or_create_user_by_telegram_id
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Caching of resolved tokens and its invalidation."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner')
+
+    def setUp(self):
+        cache.clear()
+        authentication._local_cache.clear()
+        self.token = Token.objects.create(user=self.user)
+
+    def _authenticate(self, key: str):
+        return CachedTokenAuthentication().authenticate_credentials(key)
+
+    def _get(self, key: str) -> int:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        return client.get(reverse('todos:categories:list-create')).status_code
+
+    def test_resolved_token_is_served_without_queries(self):
+        self._authenticate(self.token.key)
+
+        # Локальный LRU очищен: ответ берется из общего кэша
+        authentication._local_cache.clear()
+        with self.assertNumQueries(0):
+            user, token = self._authenticate(self.token.key)
+
+        self.assertEqual((user, token), (self.user, self.token))
+
+    def test_deleted_token_stops_authenticating(self):
+        self.assertEqual(self._get(self.token.key), 200)
+
+        self.token.delete()
+
+        self.assertEqual(self._get(self.token.key), 401)
+
+    def test_rotated_token_replaces_the_old_one(self):
+        self.assertEqual(self._get(self.token.key), 200)
+
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+
+        self.assertEqual(self._get(self.token.key), 401)
+        self.assertEqual(self._get(new_token.key), 200)
+
+    def test_deactivated_user_stops_authenticating(self):
+        self._authenticate(self.token.key)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate(self.token.key)
+        self.assertEqual(self._get(self.token.key), 401)
+
+    def test_invalid_token_is_not_cached(self):
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate('missing')
+
+        self.assertIsNone(cache.get(f"{authentication.CACHE_KEY_PREFIX}missing"))
+        self.assertNotIn('missing', authentication._local_cache)
+
+
+class TelegramSignupTests(TestCase):
+    """Resolving and creating users by their Telegram ID."""
+
+    def test_known_user_is_resolved_with_one_query(self):
+        user, token = get_or_create_user_by_telegram_id(telegram_id=42, username='alice')
+
+        with self.assertNumQueries(1):
+            resolved = get_or_create_user_by_telegram_id(telegram_id=42, username='alice')
+
+        self.assertEqual(resolved, (user, token))
+
+    def test_username_is_suffixed_with_telegram_id(self):
+        cases = [
+            (42, 'alice', 'tg_alice_42'),
+            (43, 'alice', 'tg_alice_43'),
+            (44, '', 'tg_44'),
+            (45, '45', 'tg_45'),
+        ]
+
+        for telegram_id, username, expected in cases:
+            with self.subTest(username=username):
+                user, _ = get_or_create_user_by_telegram_id(telegram_id=telegram_id, username=username)
+
+                self.assertEqual(user.username, expected)
+
+    def test_long_username_is_truncated_before_the_suffix(self):
+        user, _ = get_or_create_user_by_telegram_id(telegram_id=42, username='a' * 200)
+
+        self.assertEqual(len(user.username), 150)
+        self.assertTrue(user.username.endswith('a_42'))
+
+    def test_concurrent_signup_returns_the_winner(self):
+        winner, winner_token = get_or_create_user_by_telegram_id(telegram_id=42, username='alice')
+        lookup = services._get_user_with_token_by_telegram_id
+        calls = []
+
+        def stale_first_lookup(*, telegram_id):
+            # Первый поиск не видит пользователя, созданного параллельным запросом
+            calls.append(telegram_id)
+            return None if len(calls) == 1 else lookup(telegram_id=telegram_id)
+
+        with mock.patch.object(services, '_get_user_with_token_by_telegram_id', side_effect=stale_first_lookup):
+            user, token = get_or_create_user_by_telegram_id(telegram_id=42, username='alice')
 
-# Create your tests here.
+        self.assertEqual((user, token), (winner, winner_token))
+        self.assertEqual(User.objects.count(), 1)
+        self.assertEqual(TelegramProfile.objects.count(), 1)
+        self.assertEqual(Token.objects.count(), 1)
@@ -1,8 +1,12 @@
+from django.conf import settings
 from django.urls import path, include
-from users.apis import TelegramAuthApi
+from users.apis import TelegramAuthApi, TelegramAuthAsyncApi
+
+# Под ASGI эндпоинт обслуживается асинхронным вариантом
+telegram_auth_view = TelegramAuthAsyncApi if settings.API_ASYNC_VIEWS else TelegramAuthApi
 
 auth_patterns = [
-    path('telegram/', TelegramAuthApi.as_view(), name='telegram-auth'),
+    path('telegram/', telegram_auth_view.as_view(), name='telegram-auth'),
 ]
 
 urlpatterns = [